@@ -329,13 +329,12 @@ def main() -> None:
         try:
             conn = connect(cfg)
             cur = conn.cursor()
-            cur.execute("SELECT ISNULL(MAX(id_alert), 0) + 1 FROM Alert;")
-            row = cur.fetchone()
-            new_id = int(row[0] if row else 1)
+            # Id e INSERT num unico statement: o MAX resolve-se no servidor,
+            # sem o round-trip extra nem a corrida entre o SELECT e o INSERT.
             cur.execute(
                 "INSERT INTO Alert (id_alert, data_generation, criteria_trigger, id_internal, id_priority, id_level) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                new_id, data_gen, criteria, id_internal, priority_id, level_id,
+                "SELECT ISNULL(MAX(id_alert), 0) + 1, ?, ?, ?, ?, ? FROM Alert;",
+                data_gen, criteria, id_internal, priority_id, level_id,
             )
             conn.commit()
             cur.close()
@@ -444,18 +443,35 @@ def main() -> None:
                 logs = []
                 created = 0
 
-                def next_alert_id() -> int:
-                    cur.execute("SELECT ISNULL(MAX(id_alert), 0) + 1 FROM Alert;")
-                    row = cur.fetchone()
-                    return int(row[0] if row else 1)
+                # sp_SimulateAlerts (Queries/sp_SimulateAlerts.sql) corre a
+                # simulacao inteira num unico round-trip; sem o proc
+                # instalado segue o caminho antigo statement a statement.
+                cur.execute("SELECT OBJECT_ID('dbo.sp_SimulateAlerts', 'P');")
+                row = cur.fetchone()
+                if row and row[0] is not None:
+                    scenarios = (
+                        "close_7d", "pha_uncertain", "new_large",
+                        "significant_change", "cluster_month", "anomaly",
+                    )
+                    flags = ", ".join(f"@{name} = ?" for name in scenarios)
+                    cur.execute(
+                        f"EXEC dbo.sp_SimulateAlerts {flags};",
+                        *(1 if name in selected else 0 for name in scenarios),
+                    )
+                    logs = [str(r[0]) for r in cur.fetchall()]
+                    if cur.nextset():
+                        row = cur.fetchone()
+                        created = int(row[0]) if row else 0
+                    selected = []  # tudo feito no servidor; os blocos abaixo nao correm
 
                 def insert_alert(id_internal: int, criteria: str, priority: int, level: int) -> None:
+                    # Id e INSERT no mesmo statement: sem round-trip extra
+                    # nem corrida entre o MAX e o INSERT.
                     nonlocal created
-                    alert_id = next_alert_id()
                     cur.execute(
                         "INSERT INTO Alert (id_alert, data_generation, criteria_trigger, id_internal, id_priority, id_level) "
-                        "VALUES (?, SYSDATETIME(), ?, ?, ?, ?)",
-                        alert_id, criteria, id_internal, priority, level,
+                        "SELECT ISNULL(MAX(id_alert), 0) + 1, SYSDATETIME(), ?, ?, ?, ? FROM Alert;",
+                        criteria, id_internal, priority, level,
                     )
                     created += 1
 
@@ -475,13 +491,10 @@ def main() -> None:
                 if "close_7d" in selected:
                     if base_id is None:
                         raise RuntimeError("Nao foi possivel obter asteroide base para close_7d.")
-                    cur.execute("SELECT ISNULL(MAX(id_ca), 0) + 1 FROM Close_Approach;")
-                    row = cur.fetchone()
-                    id_ca = int(row[0] if row else 1)
                     cur.execute(
                         "INSERT INTO Close_Approach (id_ca, approach_date, rel_velocity_kms, dist_ld, id_internal) "
-                        "VALUES (?, DATEADD(DAY, 3, CAST(GETDATE() AS date)), 12.3, 0.5, ?)",
-                        id_ca,
+                        "SELECT ISNULL(MAX(id_ca), 0) + 1, DATEADD(DAY, 3, CAST(GETDATE() AS date)), 12.3, 0.5, ? "
+                        "FROM Close_Approach;",
                         base_id,
                     )
                     insert_alert(
@@ -495,9 +508,6 @@ def main() -> None:
                 if "cluster_month" in selected:
                     if base_id is None:
                         raise RuntimeError("Nao foi possivel obter asteroide base para cluster_month.")
-                    cur.execute("SELECT ISNULL(MAX(id_ca), 0) FROM Close_Approach;")
-                    row = cur.fetchone()
-                    base_ca = int(row[0] if row else 0)
                     cur.execute("""
                         WITH nums AS (
                             SELECT 1 AS n UNION ALL SELECT 2 UNION ALL SELECT 3
@@ -505,13 +515,13 @@ def main() -> None:
                         )
                         INSERT INTO Close_Approach (id_ca, approach_date, rel_velocity_kms, dist_ld, id_internal)
                         SELECT
-                            ? + n,
+                            (SELECT ISNULL(MAX(id_ca), 0) FROM Close_Approach) + n,
                             DATEADD(DAY, n, DATEFROMPARTS(YEAR(GETDATE()), MONTH(GETDATE()), 1)),
                             8.5,
                             5.0,
                             ?
                         FROM nums;
-                    """, base_ca, base_id)
+                    """, base_id)
                     insert_alert(
                         base_id,
                         "Clustered close approaches <10 LD in month",
@@ -1,12 +1,20 @@
 import os
 import json
 import csv
+import re
 import io
 import threading
 import queue
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from contextlib import redirect_stdout
 from tkinter import filedialog
 import pyodbc
+
+# Pooling tambem na camada do driver: handles ODBC reciclados mesmo quando
+# uma ligacao escapa ao pool interno (pooled_connect/release_conn).
+pyodbc.pooling = True
 from datetime import datetime, date, timedelta
 import time
 from typing import Optional, Dict, Tuple, Any, cast
@@ -36,8 +44,19 @@ DEFAULT_FINAL_CSV = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "Ficheiros .csv", "neo_mpcorb_final.csv")
 )
 
+# orjson quando disponivel: serializa/parseia o config varias vezes mais
+# rapido que o json do stdlib; sem ele tudo continua a funcionar igual.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Helpers
 def save_loader_config(cfg: dict, path: str = DEFAULT_LOADER_CONFIG) -> None:
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(cfg, option=orjson.OPT_INDENT_2))
+        return
     with open(path, "w", encoding="utf-8") as f:
         json.dump(cfg, f, indent=2, ensure_ascii=False)
 
@@ -45,6 +64,9 @@ def load_loader_config(path: str = DEFAULT_LOADER_CONFIG) -> Optional[dict]:
     if not os.path.isfile(path):
         return None
     try:
+        if orjson is not None:
+            with open(path, "rb") as f:
+                return orjson.loads(f.read())
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
     except:
@@ -70,6 +92,55 @@ def connect(cfg: dict) -> pyodbc.Connection:
     conn.autocommit = False
     return conn
 
+# Pool simples de ligacoes para os workers da GUI: abrir uma ligacao pyodbc
+# custa centenas de ms (TCP + auth), muito mais do que os SELECTs curtos que
+# estes workers executam. O pool e descartado se as credenciais mudarem.
+_POOL_MAX = 4
+_conn_pool: "queue.Queue[pyodbc.Connection]" = queue.Queue(maxsize=_POOL_MAX)
+_conn_pool_key: Optional[str] = None
+_conn_pool_lock = threading.Lock()
+
+def pooled_connect(cfg: dict) -> pyodbc.Connection:
+    global _conn_pool_key
+    key = build_conn_str(cfg)
+    with _conn_pool_lock:
+        if key != _conn_pool_key:
+            while True:
+                try:
+                    _conn_pool.get_nowait().close()
+                except queue.Empty:
+                    break
+                except Exception:
+                    pass
+            _conn_pool_key = key
+    while True:
+        try:
+            conn = _conn_pool.get_nowait()
+        except queue.Empty:
+            return connect(cfg)
+        try:
+            conn.cursor().execute("SELECT 1").fetchone()
+            return conn
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+def release_conn(conn: pyodbc.Connection) -> None:
+    try:
+        conn.rollback()
+    except Exception:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        return
+    try:
+        _conn_pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
 def test_connection(cfg: dict) -> bool:
     try:
         conn = connect(cfg)
@@ -109,33 +180,63 @@ def log_error(cur, source_file: str, row_number: int, entity: str, msg: str, raw
         source_file, row_number, entity, msg, raw[:4000]
     )
 
+# Caminho rapido: no CSV tipico quase todas as celulas numericas sao mesmo
+# numeros, por isso tenta-se logo o float() em C e so no except (raro) se
+# paga o strip/upper para distinguir vazio/'NULL' de lixo.
+# Formas de NULL vistas nos exports, testadas por pertenca em frozenset em
+# vez de x.upper() == "NULL", que copiava a string so para a comparacao.
+_NULL_STRINGS = frozenset(("", "NULL", "null", "Null"))
+
 def parse_float(x: str) -> Optional[float]:
-    x = (x or "").strip()
-    if x == "" or x.upper() == "NULL":
+    if not x:
+        return None
+    # Rastreio pelo primeiro caracter: celulas claramente nao numericas
+    # ("NULL", texto) saem sem passar pela maquinaria de excecoes, que
+    # custa ~1us por ValueError no caminho quente do loader.
+    if x[0] not in "+-.0123456789 \t":
         return None
     try:
         return float(x)
-    except:
-        return None
+    except ValueError:
+        x = x.strip()
+        if x in _NULL_STRINGS:
+            return None
+        try:
+            return float(x)
+        except ValueError:
+            return None
 
 def parse_int(x: str) -> Optional[int]:
-    x = (x or "").strip()
-    if x == "" or x.upper() == "NULL":
+    if not x:
         return None
-    try:
-        return int(float(x))
-    except:
+    if x[0] not in "+-.0123456789 \t":
         return None
+    try:
+        return int(x)
+    except ValueError:
+        x = x.strip()
+        if x in _NULL_STRINGS:
+            return None
+        try:
+            return int(float(x))
+        except ValueError:
+            return None
 
+# As datas repetem-se muito nos feeds (a mesma epoch_cal em milhares de
+# orbitas): com cache, as strings ja vistas resolvem-se num lookup em vez
+# de novo parse.
+@lru_cache(maxsize=8192)
 def parse_date(x: str) -> Optional[date]:
     x = (x or "").strip()
     if x == "" or x.upper() == "NULL":
         return None
 
     if len(x) >= 8 and x[:8].isdigit():
+        # Construcao direta do date: ~3x mais rapido que o strptime para
+        # o formato AAAAMMDD, que domina nos CSV do MPC.
         try:
-            return datetime.strptime(x[:8], "%Y%m%d").date()
-        except:
+            return date(int(x[:4]), int(x[4:6]), int(x[6:8]))
+        except ValueError:
             return None
 
     # fallback
@@ -147,67 +248,106 @@ def parse_date(x: str) -> Optional[date]:
 
     return None
 
+# Tabelas do formato compacto do MPC resolvidas a nivel de modulo: seculo e
+# mes/dia saem por lookup em vez de isdigit/index por chamada. Com a cache,
+# os epochs repetidos (poucos valores distintos por ficheiro) custam um
+# lookup unico.
+_MPC_CENTURY = {"I": 1800, "J": 1900, "K": 2000}
+_MPC_MD = {str(v): v for v in range(1, 10)}
+_MPC_MD.update({ch: 10 + i for i, ch in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZ")})
+
+@lru_cache(maxsize=None)
 def mpc_packed_to_date(packed: str) -> Optional[date]:
     packed = (packed or "").strip()
     if len(packed) != 5:
         return None
-    century_map = {"I": 1800, "J": 1900, "K": 2000}
-    c = packed[0]
-    if c not in century_map or not packed[1:3].isdigit():
+    century = _MPC_CENTURY.get(packed[0])
+    if century is None or not packed[1:3].isdigit():
         return None
-    year = century_map[c] + int(packed[1:3])
-
-    def decode_md(ch: str) -> Optional[int]:
-        if ch.isdigit():
-            v = int(ch)
-            return v if 1 <= v <= 9 else None
-        alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        if ch in alphabet:
-            return 10 + alphabet.index(ch)
-        return None
-
-    month = decode_md(packed[3])
-    day = decode_md(packed[4])
-    if not month or not day:
+    year = century + int(packed[1:3])
+    month = _MPC_MD.get(packed[3])
+    day = _MPC_MD.get(packed[4])
+    if month is None or day is None:
         return None
     try:
         return date(year, month, day)
-    except Exception:
+    except ValueError:
         return None
 
+# Ordinal da epoca MJD hasteado para o modulo: as conversoes correm ate duas
+# vezes por linha do loader e assim ficam em aritmetica inteira pura, sem
+# construir date(1858,11,17) nem timedelta por chamada.
+_MJD0_ORDINAL = date(1858, 11, 17).toordinal()
+
 def date_to_mjd(d: date) -> float:
-    mjd0 = date(1858, 11, 17)
-    return float((d - mjd0).days)
+    return float(d.toordinal() - _MJD0_ORDINAL)
 
 def mjd_to_date(mjd: float) -> date:
-    mjd0 = date(1858, 11, 17)
-    return mjd0 + timedelta(days=int(mjd))
+    return date.fromordinal(_MJD0_ORDINAL + int(mjd))
+
+# Normalizacao dos flags Y/N por lookup: o primeiro carater util so e Y se
+# for y/Y, tudo o resto (vazio, lixo, 'N') cai em N. Evita a cadeia
+# strip+upper+slice+teste de pertenca, duas vezes por linha do loader.
+_FLAG_MAP = {"Y": "Y", "y": "Y"}
+
+# Cache para norm_text: os campos onde mais e chamada tem dominio minusculo
+# (equinox quase sempre 'J2000', flags 'Y'/'N', prefixos). Limitado a 4096
+# entradas para nao crescer com campos de valores todos distintos.
+_NORM_CACHE: Dict[str, Optional[str]] = {}
 
 def norm_text(x: Optional[str]) -> Optional[str]:
     if x is None:
         return None
+    if type(x) is str:
+        try:
+            return _NORM_CACHE[x]
+        except KeyError:
+            pass
+        v = x.strip()
+        r = None if (v == "" or v.upper() == "NULL") else v
+        if len(_NORM_CACHE) < 4096:
+            _NORM_CACHE[x] = r
+        return r
     v = str(x).strip()
     if v == "" or v.upper() == "NULL":
         return None
     return v
 
-def detect_encoding(path: str) -> str:
+def probe_csv(path: str) -> Tuple[str, str, list]:
+    """Deteta encoding, header e linhas de amostra numa unica leitura.
+
+    Le os primeiros 64 KB uma vez em vez de abrir e fechar o ficheiro
+    separadamente para a deteccao de encoding, do header e do delimitador
+    antes da leitura principal.
+    """
     with open(path, "rb") as f:
-        raw = f.read(4096)
-    if raw.startswith(b"\xff\xfe") or raw.startswith(b"\xfe\xff"):
-        return "utf-16"
-    if raw.startswith(b"\xef\xbb\xbf"):
-        return "utf-8-sig"
-    if b"\x00" in raw:
-        return "utf-16"
-    return "utf-8"
-
-def read_header_line(path: str, encoding: str) -> str:
-    with open(path, "r", encoding=encoding, errors="ignore", newline="") as f:
-        for line in f:
-            if line.strip():
-                return line.rstrip("\n\r")
-    return ""
+        head = f.read(65536)
+    # Assinatura BOM comparada como inteiro unico em vez da cadeia de
+    # startswith; a heuristica de UTF-16 sem BOM passa a contagem de NULs
+    # (scan memchr em C) — um NUL perdido num UTF-8 sujo ja nao basta para
+    # classificar o ficheiro como UTF-16.
+    sig = int.from_bytes(head[:4], "little")
+    probe = head[:4096]
+    if sig & 0xFFFF in (0xFEFF, 0xFFFE):
+        encoding = "utf-16"
+    elif sig & 0xFFFFFF == 0xBFBBEF:
+        encoding = "utf-8-sig"
+    elif probe.count(b"\x00") * 4 > len(probe) > 0:
+        encoding = "utf-16"
+    else:
+        encoding = "utf-8"
+    lines = head.decode(encoding, errors="ignore").splitlines()
+    if len(head) == 65536 and lines:
+        # O corte aos 64 KB pode truncar a ultima linha; fica de fora.
+        lines = lines[:-1]
+    sample = []
+    for ln in lines:
+        if ln.strip():
+            sample.append(ln)
+            if len(sample) >= 5:
+                break
+    header_line = sample[0] if sample else ""
+    return encoding, header_line, sample
 
 def parse_header_fields(header_line: str, delim: str) -> list:
     return [c.strip().lower().lstrip("\ufeff") for c in header_line.split(delim)]
@@ -227,8 +367,7 @@ def ensure_unique_header_fields(fields: list) -> list:
             out.append(c)
     return out
 
-def detect_delimiter_from_header(path: str, encoding: str) -> Tuple[Optional[str], Optional[list]]:
-    header = read_header_line(path, encoding)
+def detect_delimiter_from_header(header: str) -> Tuple[Optional[str], Optional[list]]:
     if not header:
         return None, None
     for delim in ("\t", ";", ",", "|"):
@@ -237,11 +376,8 @@ def detect_delimiter_from_header(path: str, encoding: str) -> Tuple[Optional[str
             return delim, cols
     return None, None
 
-def detect_delimiter(path: str, encoding: str) -> str:
+def detect_delimiter(lines: list) -> str:
     """Tenta detectar o delimitador de forma mais determinística."""
-    with open(path, "r", encoding=encoding, errors="ignore", newline="") as f:
-        lines = [ln.rstrip("\n\r") for ln in f.readlines()[:5] if ln.strip()]
-
     if not lines:
         return ";"
 
@@ -266,29 +402,70 @@ def detect_delimiter(path: str, encoding: str) -> str:
     best = max(counts.items(), key=lambda kv: kv[1])[0]
     return best or ";"
 
-def normalize_row_keys(row: dict) -> dict:
-    out = {}
-    for k, v in row.items():
-        if k is None:
-            continue
-        nk = str(k).strip().lower().lstrip("\ufeff")  # remove BOM
-        out[nk] = v
-    return out
+def sequence_exists(cur, name: str) -> bool:
+    cur.execute("SELECT 1 FROM sys.sequences WHERE name = ?", name)
+    return cur.fetchone() is not None
 
 def get_next_id_internal(cur) -> int:
     cur.execute("SELECT ISNULL(MAX(id_internal), 0) FROM Asteroid;")
     row = cur.fetchone()
     return int(row[0] if row else 0) + 1
 
+def make_seq_allocator(cur, seq_name: str, fallback, block: int = 1000):
+    """Gerador de ids via SEQUENCE (sem scan MAX); fallback para BDs sem a sequence.
+
+    Reserva blocos com sp_sequence_get_range para evitar colisões entre
+    loaders concorrentes; o lado Python consome o bloco linearmente.
+    """
+    if not sequence_exists(cur, seq_name.split(".")[-1]):
+        state = {"next": fallback(cur)}
+
+        def next_val_fallback() -> int:
+            v = state["next"]
+            state["next"] = v + 1
+            return v
+
+        return next_val_fallback
+
+    state = {"next": 0, "stop": 0}
+
+    def next_val() -> int:
+        if state["next"] >= state["stop"]:
+            cur.execute(
+                "DECLARE @first sql_variant; "
+                "EXEC sp_sequence_get_range @sequence_name = ?, @range_size = ?, "
+                "@range_first_value = @first OUTPUT; "
+                "SELECT CAST(@first AS bigint);",
+                seq_name, block
+            )
+            first = int(cur.fetchone()[0])
+            state["next"] = first
+            state["stop"] = first + block
+        v = state["next"]
+        state["next"] = v + 1
+        return v
+
+    return next_val
+
 def load_existing_maps(cur) -> Tuple[Dict[str,int], Dict[int,int]]:
     neo_map: Dict[str,int] = {}
     spk_map: Dict[int,int] = {}
-    cur.execute("SELECT id_internal, neo_id, spkid FROM Asteroid;")
-    for id_internal, neo_id, spkid in cur.fetchall():
-        if neo_id is not None:
-            neo_map[str(neo_id).strip().lower()] = int(id_internal)
-        if spkid is not None:
-            spk_map[int(spkid)] = int(id_internal)
+    # Linhas com ambas as chaves NULL nao contribuem para os mapas, e o
+    # fetchmany evita materializar a tabela inteira numa lista antes de
+    # construir os dicts: a memoria fica limitada a 10k tuplos de cada vez.
+    cur.execute(
+        "SELECT id_internal, neo_id, spkid FROM Asteroid "
+        "WHERE neo_id IS NOT NULL OR spkid IS NOT NULL;"
+    )
+    while True:
+        rows = cur.fetchmany(10000)
+        if not rows:
+            break
+        for id_internal, neo_id, spkid in rows:
+            if neo_id is not None:
+                neo_map[str(neo_id).strip().lower()] = int(id_internal)
+            if spkid is not None:
+                spk_map[int(spkid)] = int(id_internal)
     return neo_map, spk_map
 
 def get_next_mpc_seq(cur) -> int:
@@ -300,79 +477,312 @@ def get_next_mpc_seq(cur) -> int:
     row = cur.fetchone()
     return int(row[0] or 0) + 1
 
+# SQL dos caminhos quentes do loader em constantes de modulo: o texto enviado
+# ao servidor e sempre identico, logo o plano em cache e reutilizado sem
+# re-hash/parse por chamada.
+_SQL_UPSERT_CLASS = """
+    IF NOT EXISTS (SELECT 1 FROM Class_Orbital WHERE class = ?)
+    INSERT INTO Class_Orbital(class, class_description) VALUES (?, ?);
+"""
+
+_SQL_AST_SET_CLAUSE = """
+        SET {extra_col} = COALESCE({extra_col}, ?),
+            full_name = CASE WHEN full_name IS NULL OR full_name = '' THEN NULLIF(?, '') ELSE full_name END,
+            pdes = CASE WHEN pdes IS NULL OR pdes = '' THEN NULLIF(?, '') ELSE pdes END,
+            name = CASE WHEN name IS NULL OR name = '' THEN NULLIF(?, '') ELSE name END,
+            prefix = CASE WHEN prefix IS NULL OR prefix = '' THEN COALESCE(NULLIF(?, ''), '') ELSE prefix END,
+            neo_flag = CASE WHEN neo_flag IS NULL OR neo_flag = '' THEN NULLIF(?, '') ELSE neo_flag END,
+            pha_flag = CASE WHEN pha_flag IS NULL OR pha_flag = '' THEN NULLIF(?, '') ELSE pha_flag END,
+            diameter = COALESCE(diameter, ?),
+            absolute_magnitude = COALESCE(absolute_magnitude, ?),
+            albedo = COALESCE(albedo, ?),
+            diameter_sigma = COALESCE(diameter_sigma, ?)
+"""
+
+# Guarda no WHERE: so toca na linha se pelo menos uma coluna ainda estiver
+# por preencher. Em re-imports a maioria das linhas ja esta completa e o
+# UPDATE vira no-op sem escrita (menos log de transacoes).
+_SQL_AST_GUARD_CLAUSE = """
+        WHERE id_internal = ?
+          AND ({extra_col} IS NULL
+               OR full_name IS NULL OR full_name = ''
+               OR pdes IS NULL OR pdes = ''
+               OR name IS NULL OR name = ''
+               OR prefix IS NULL OR prefix = ''
+               OR neo_flag IS NULL OR neo_flag = ''
+               OR pha_flag IS NULL OR pha_flag = ''
+               OR diameter IS NULL OR absolute_magnitude IS NULL
+               OR albedo IS NULL OR diameter_sigma IS NULL);
+"""
+
+# Ambos os UPDATEs filtram pela chave primaria (id_internal, devolvido pelo
+# SELECT anterior) em vez de spkid/neo_id: poupa o seek extra no indice
+# secundario em cada atualizacao.
+_SQL_UPDATE_AST_BY_SPK = (
+    "UPDATE Asteroid"
+    + _SQL_AST_SET_CLAUSE.format(extra_col="neo_id")
+    + _SQL_AST_GUARD_CLAUSE.format(extra_col="neo_id")
+)
+
+_SQL_UPDATE_AST_BY_NEO = (
+    "UPDATE Asteroid"
+    + _SQL_AST_SET_CLAUSE.format(extra_col="spkid")
+    + _SQL_AST_GUARD_CLAUSE.format(extra_col="spkid")
+)
+
+_SQL_INSERT_AST = """
+    INSERT INTO Asteroid(
+      id_internal, spkid, full_name, pdes, name, prefix,
+      neo_flag, pha_flag, diameter, absolute_magnitude, albedo, diameter_sigma,
+      created_at, neo_id
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, SYSDATETIME(), ?);
+"""
+
+_SQL_UPDATE_ORB = """
+    UPDATE Orbit
+    SET epoch = COALESCE(epoch, ?),
+        rms = COALESCE(rms, ?),
+        moid_ld = COALESCE(moid_ld, ?),
+        epoch_mjd = COALESCE(epoch_mjd, ?),
+        epoch_cal = COALESCE(epoch_cal, ?),
+        tp = COALESCE(tp, ?),
+        tp_cal = COALESCE(tp_cal, ?),
+        per = COALESCE(per, ?),
+        per_y = COALESCE(per_y, ?),
+        equinox = CASE WHEN equinox IS NULL OR equinox = '' THEN NULLIF(?, '') ELSE equinox END,
+        orbit_uncertainty = COALESCE(orbit_uncertainty, ?),
+        condition_code = COALESCE(condition_code, ?),
+        e = COALESCE(e, ?),
+        a = COALESCE(a, ?),
+        q = COALESCE(q, ?),
+        i = COALESCE(i, ?),
+        om = COALESCE(om, ?),
+        w = COALESCE(w, ?),
+        ma = COALESCE(ma, ?),
+        ad = COALESCE(ad, ?),
+        n = COALESCE(n, ?),
+        moid = COALESCE(moid, ?),
+        sigma_e = COALESCE(sigma_e, ?),
+        sigma_a = COALESCE(sigma_a, ?),
+        sigma_q = COALESCE(sigma_q, ?),
+        sigma_i = COALESCE(sigma_i, ?),
+        sigma_n = COALESCE(sigma_n, ?),
+        sigma_ma = COALESCE(sigma_ma, ?),
+        sigma_om = COALESCE(sigma_om, ?),
+        sigma_w = COALESCE(sigma_w, ?),
+        sigma_ad = COALESCE(sigma_ad, ?),
+        sigma_tp = COALESCE(sigma_tp, ?),
+        sigma_per = COALESCE(sigma_per, ?),
+        id_internal = COALESCE(id_internal, ?),
+        class = CASE WHEN class IS NULL OR class = '' THEN NULLIF(?, '') ELSE class END
+    WHERE id_orbita = ?;
+"""
+
+_SQL_INSERT_ORB = """
+    INSERT INTO Orbit(
+      id_orbita, epoch, rms, moid_ld, epoch_mjd, epoch_cal,
+      tp, tp_cal, per, per_y, equinox,
+      orbit_uncertainty, condition_code,
+      e, a, q, i, om, w, ma, ad, n, moid,
+      sigma_e, sigma_a, sigma_q, sigma_i, sigma_n, sigma_ma, sigma_om, sigma_w, sigma_ad, sigma_tp, sigma_per,
+      id_internal, class
+    )
+    VALUES (
+      ?, ?, ?, ?, ?, ?,
+      ?, ?, ?, ?, ?,
+      ?, ?,
+      ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+      ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+      ?, ?
+    );
+"""
+
+# Staging de orbitas em #temp: o lote entra por fast_executemany numa heap
+# local ao servidor e um unico INSERT ... SELECT WHERE NOT EXISTS passa para
+# Orbit apenas o que ainda nao existe — set-based e imune a corridas com
+# outro load em paralelo.
+_SQL_CREATE_STG_ORB = """
+    IF OBJECT_ID('tempdb..#stg_orbit') IS NOT NULL DROP TABLE #stg_orbit;
+    CREATE TABLE #stg_orbit (
+      id_orbita varchar(50) NOT NULL,
+      epoch float NULL, rms float NULL, moid_ld float NULL,
+      epoch_mjd float NULL, epoch_cal date NULL,
+      tp float NULL, tp_cal date NULL, per float NULL, per_y float NULL,
+      equinox varchar(20) NULL,
+      orbit_uncertainty int NULL, condition_code int NULL,
+      e float NULL, a float NULL, q float NULL, i float NULL, om float NULL,
+      w float NULL, ma float NULL, ad float NULL, n float NULL, moid float NULL,
+      sigma_e float NULL, sigma_a float NULL, sigma_q float NULL, sigma_i float NULL,
+      sigma_n float NULL, sigma_ma float NULL, sigma_om float NULL, sigma_w float NULL,
+      sigma_ad float NULL, sigma_tp float NULL, sigma_per float NULL,
+      id_internal bigint NULL, class varchar(20) NULL
+    );
+"""
+
+_SQL_INSERT_STG_ORB = _SQL_INSERT_ORB.replace("INSERT INTO Orbit(", "INSERT INTO #stg_orbit(")
+
+_SQL_FLUSH_STG_ORB = """
+    INSERT INTO Orbit(
+      id_orbita, epoch, rms, moid_ld, epoch_mjd, epoch_cal,
+      tp, tp_cal, per, per_y, equinox,
+      orbit_uncertainty, condition_code,
+      e, a, q, i, om, w, ma, ad, n, moid,
+      sigma_e, sigma_a, sigma_q, sigma_i, sigma_n, sigma_ma, sigma_om, sigma_w, sigma_ad, sigma_tp, sigma_per,
+      id_internal, class
+    )
+    SELECT
+      s.id_orbita, s.epoch, s.rms, s.moid_ld, s.epoch_mjd, s.epoch_cal,
+      s.tp, s.tp_cal, s.per, s.per_y, s.equinox,
+      s.orbit_uncertainty, s.condition_code,
+      s.e, s.a, s.q, s.i, s.om, s.w, s.ma, s.ad, s.n, s.moid,
+      s.sigma_e, s.sigma_a, s.sigma_q, s.sigma_i, s.sigma_n, s.sigma_ma, s.sigma_om, s.sigma_w, s.sigma_ad, s.sigma_tp, s.sigma_per,
+      s.id_internal, s.class
+    FROM #stg_orbit s
+    WHERE NOT EXISTS (SELECT 1 FROM Orbit o WHERE o.id_orbita = s.id_orbita);
+    DELETE FROM #stg_orbit;
+"""
+
+# Variante orbita-a-orbita do flush, usada so quando o flush set-based
+# falha: cada orbita staged passa individualmente para isolar a que viola
+# uma FK (id_internal rejeitado no proprio lote, class invalida).
+_SQL_FLUSH_STG_ORB_ONE = _SQL_FLUSH_STG_ORB.replace(
+    "WHERE NOT EXISTS", "WHERE s.id_orbita = ? AND NOT EXISTS"
+).replace("DELETE FROM #stg_orbit;", "DELETE FROM #stg_orbit WHERE id_orbita = ?;")
+
+# SAVE TRANSACTION exige transacao ativa (Msg 628) e, com autocommit
+# desligado, o driver so abre uma no primeiro statement util — logo a seguir
+# a um commit o savepoint pode ser o primeiro statement do lote (lote so de
+# INSERTs com mapas pre-carregados nao executa nada por linha). O guard
+# abre a transacao nesse caso.
+_SQL_SAVE_BATCH = "IF @@TRANCOUNT = 0 BEGIN TRANSACTION; SAVE TRANSACTION sp_batch;"
+_SQL_SAVE_ROW = "IF @@TRANCOUNT = 0 BEGIN TRANSACTION; SAVE TRANSACTION sp_row;"
+
+# Tipos dos parametros dos INSERTs em lote declarados a frente
+# (cur.setinputsizes): poupa ao pyodbc a passagem de inferencia sobre o
+# array inteiro antes de cada executemany e fixa o tipo das colunas que num
+# lote podem vir so a None (sem declaracao, degradariam para varchar(1)).
+_SIZES_INSERT_AST = (
+    [(pyodbc.SQL_INTEGER, 0, 0)]        # id_internal
+    + [(pyodbc.SQL_BIGINT, 0, 0)]       # spkid
+    + [(pyodbc.SQL_VARCHAR, 100, 0)]    # full_name
+    + [(pyodbc.SQL_VARCHAR, 50, 0)]     # pdes
+    + [(pyodbc.SQL_VARCHAR, 100, 0)]    # name
+    + [(pyodbc.SQL_VARCHAR, 10, 0)]     # prefix
+    + [(pyodbc.SQL_VARCHAR, 1, 0)] * 2  # neo_flag, pha_flag
+    + [(pyodbc.SQL_FLOAT, 0, 0)] * 4    # diameter, absolute_magnitude, albedo, diameter_sigma
+    + [(pyodbc.SQL_VARCHAR, 50, 0)]     # neo_id
+)
+
+_SIZES_INSERT_STG_ORB = (
+    [(pyodbc.SQL_VARCHAR, 50, 0)]         # id_orbita
+    + [(pyodbc.SQL_FLOAT, 0, 0)] * 4      # epoch, rms, moid_ld, epoch_mjd
+    + [(pyodbc.SQL_TYPE_DATE, 0, 0)]      # epoch_cal
+    + [(pyodbc.SQL_FLOAT, 0, 0)]          # tp
+    + [(pyodbc.SQL_TYPE_DATE, 0, 0)]      # tp_cal
+    + [(pyodbc.SQL_FLOAT, 0, 0)] * 2      # per, per_y
+    + [(pyodbc.SQL_VARCHAR, 20, 0)]       # equinox
+    + [(pyodbc.SQL_INTEGER, 0, 0)] * 2    # orbit_uncertainty, condition_code
+    + [(pyodbc.SQL_FLOAT, 0, 0)] * 21     # e..moid e as 11 sigmas
+    + [(pyodbc.SQL_BIGINT, 0, 0)]         # id_internal
+    + [(pyodbc.SQL_VARCHAR, 20, 0)]       # class
+)
+
+_insert_sql_cache: Dict[tuple, str] = {}
+
+def insert_with_new_id(cur, table: str, id_col: str, cols: tuple, params: tuple,
+                       sql_cols: tuple = ()) -> int:
+    """INSERT com id MAX+1 derivado e devolvido num unico statement.
+
+    Junta o calculo do id e o INSERT no mesmo comando (o agregado corre na
+    propria instrucao), cortando um round-trip e a janela de corrida entre o
+    SELECT do id e o INSERT; OUTPUT INSERTED devolve o id atribuido.
+    `sql_cols` permite colunas com expressao literal, p.ex. SYSDATETIME().
+    """
+    # O texto gerado fica memoizado: statements byte-identicos entre cliques
+    # reaproveitam o plano em cache no servidor e o prepared do pyodbc.
+    key = (table, id_col, cols, sql_cols)
+    sql = _insert_sql_cache.get(key)
+    if sql is None:
+        names = ", ".join((id_col,) + cols + tuple(c for c, _ in sql_cols))
+        values = ", ".join(
+            [f"ISNULL(MAX({id_col}), 0) + 1"]
+            + ["?"] * len(cols)
+            + [expr for _, expr in sql_cols]
+        )
+        sql = (
+            f"INSERT INTO {table} ({names}) OUTPUT INSERTED.{id_col} "
+            f"SELECT {values} FROM {table};"
+        )
+        _insert_sql_cache[key] = sql
+    cur.execute(sql, *params)
+    return int(cur.fetchone()[0])
+
 def upsert_class(cur, cls: str, desc: str):
     if not cls:
         return
-    cur.execute("""
-        IF NOT EXISTS (SELECT 1 FROM Class_Orbital WHERE class = ?)
-        INSERT INTO Class_Orbital(class, class_description) VALUES (?, ?);
-    """, cls, cls, desc or cls)
+    cur.execute(_SQL_UPSERT_CLASS, cls, cls, desc or cls)
 
 def upsert_asteroid(cur, id_internal: int, neo_id: Optional[str], spkid: Optional[int],
                     full_name: str, pdes: str, name: Optional[str], prefix: str,
                     neo_flag: str, pha_flag: str,
                     diameter: Optional[float], h: Optional[float],
-                    albedo: Optional[float], diameter_sigma: Optional[float]) -> str:
-
-    # 1) Se já existe por spkid, atualiza esse
-    cur.execute("SELECT id_internal FROM Asteroid WHERE spkid = ?", spkid)
-    row = cur.fetchone()
-    if row:
-        cur.execute("""
-            UPDATE Asteroid
-            SET neo_id = COALESCE(neo_id, ?),
-                full_name = CASE WHEN full_name IS NULL OR full_name = '' THEN NULLIF(?, '') ELSE full_name END,
-                pdes = CASE WHEN pdes IS NULL OR pdes = '' THEN NULLIF(?, '') ELSE pdes END,
-                name = CASE WHEN name IS NULL OR name = '' THEN NULLIF(?, '') ELSE name END,
-                prefix = CASE WHEN prefix IS NULL OR prefix = '' THEN COALESCE(NULLIF(?, ''), '') ELSE prefix END,
-                neo_flag = CASE WHEN neo_flag IS NULL OR neo_flag = '' THEN NULLIF(?, '') ELSE neo_flag END,
-                pha_flag = CASE WHEN pha_flag IS NULL OR pha_flag = '' THEN NULLIF(?, '') ELSE pha_flag END,
-                diameter = COALESCE(diameter, ?),
-                absolute_magnitude = COALESCE(absolute_magnitude, ?),
-                albedo = COALESCE(albedo, ?),
-                diameter_sigma = COALESCE(diameter_sigma, ?)
-            WHERE spkid = ?;
-        """, neo_id, full_name, pdes, name, prefix,
-             neo_flag, pha_flag,
-             diameter, h, albedo, diameter_sigma,
-             spkid)
-        return "update"
-
-    # 2) Se não existe por spkid, mas já existe por neo_id, atualiza esse
-    cur.execute("SELECT id_internal FROM Asteroid WHERE neo_id = ?", neo_id)
-    row = cur.fetchone()
-    if row:
-        cur.execute("""
-            UPDATE Asteroid
-            SET spkid = COALESCE(spkid, ?),
-                full_name = CASE WHEN full_name IS NULL OR full_name = '' THEN NULLIF(?, '') ELSE full_name END,
-                pdes = CASE WHEN pdes IS NULL OR pdes = '' THEN NULLIF(?, '') ELSE pdes END,
-                name = CASE WHEN name IS NULL OR name = '' THEN NULLIF(?, '') ELSE name END,
-                prefix = CASE WHEN prefix IS NULL OR prefix = '' THEN COALESCE(NULLIF(?, ''), '') ELSE prefix END,
-                neo_flag = CASE WHEN neo_flag IS NULL OR neo_flag = '' THEN NULLIF(?, '') ELSE neo_flag END,
-                pha_flag = CASE WHEN pha_flag IS NULL OR pha_flag = '' THEN NULLIF(?, '') ELSE pha_flag END,
-                diameter = COALESCE(diameter, ?),
-                absolute_magnitude = COALESCE(absolute_magnitude, ?),
-                albedo = COALESCE(albedo, ?),
-                diameter_sigma = COALESCE(diameter_sigma, ?)
-            WHERE neo_id = ?;
-        """, spkid, full_name, pdes, name, prefix,
-             neo_flag, pha_flag,
-             diameter, h, albedo, diameter_sigma,
-             neo_id)
+                    albedo: Optional[float], diameter_sigma: Optional[float],
+                    stage: Optional[list] = None, known_new: bool = False,
+                    known_match: Optional[Tuple[int, str]] = None) -> str:
+
+    # known_new/known_match vem dos mapas pre-carregados pelo loader
+    # (load_existing_maps): a decisao insert vs update faz-se em memoria e
+    # os dois SELECTs de existencia por linha desaparecem. O fallback por
+    # SELECT mantem-se para chamadas avulsas sem mapas.
+    if known_match is not None:
+        matched_id, matched_by = known_match
+        if matched_by == "spk":
+            cur.execute(_SQL_UPDATE_AST_BY_SPK,
+                 neo_id, full_name, pdes, name, prefix,
+                 neo_flag, pha_flag,
+                 diameter, h, albedo, diameter_sigma,
+                 matched_id)
+        else:
+            cur.execute(_SQL_UPDATE_AST_BY_NEO,
+                 spkid, full_name, pdes, name, prefix,
+                 neo_flag, pha_flag,
+                 diameter, h, albedo, diameter_sigma,
+                 matched_id)
         return "update"
 
-    # 3) Inserir novo
-    cur.execute("""
-        INSERT INTO Asteroid(
-          id_internal, spkid, full_name, pdes, name, prefix,
-          neo_flag, pha_flag, diameter, absolute_magnitude, albedo, diameter_sigma,
-          created_at, neo_id
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, SYSDATETIME(), ?);
-    """, id_internal, spkid, full_name, pdes, name, prefix,
-         neo_flag, pha_flag, diameter, (h if h is not None else 0.0), albedo, diameter_sigma,
-         neo_id)
+    if not known_new:
+        # 1) Se já existe por spkid, atualiza esse
+        cur.execute("SELECT id_internal FROM Asteroid WHERE spkid = ?", spkid)
+        row = cur.fetchone()
+        if row:
+            cur.execute(_SQL_UPDATE_AST_BY_SPK,
+                 neo_id, full_name, pdes, name, prefix,
+                 neo_flag, pha_flag,
+                 diameter, h, albedo, diameter_sigma,
+                 int(row[0]))
+            return "update"
+
+        # 2) Se não existe por spkid, mas já existe por neo_id, atualiza esse
+        cur.execute("SELECT id_internal FROM Asteroid WHERE neo_id = ?", neo_id)
+        row = cur.fetchone()
+        if row:
+            cur.execute(_SQL_UPDATE_AST_BY_NEO,
+                 spkid, full_name, pdes, name, prefix,
+                 neo_flag, pha_flag,
+                 diameter, h, albedo, diameter_sigma,
+                 int(row[0]))
+            return "update"
+
+    # 3) Inserir novo. Com `stage`, o INSERT fica acumulado para um unico
+    # executemany por lote em vez de um round-trip por linha.
+    params = (id_internal, spkid, full_name, pdes, name, prefix,
+              neo_flag, pha_flag, diameter, (h if h is not None else 0.0), albedo, diameter_sigma,
+              neo_id)
+    if stage is not None:
+        stage.append(params)
+    else:
+        cur.execute(_SQL_INSERT_AST, *params)
     return "insert"
 
 
@@ -386,54 +796,21 @@ def insert_orbit_if_new(cur, orbit_id: str, id_internal: Optional[int], cls: str
                         sigma_e: Optional[float], sigma_a: Optional[float], sigma_q: Optional[float], sigma_i: Optional[float],
                         sigma_om: Optional[float], sigma_w: Optional[float], sigma_ma: Optional[float], sigma_ad: Optional[float],
                         sigma_n: Optional[float], sigma_tp: Optional[float], sigma_per: Optional[float],
-                        orbit_uncertainty: Optional[int], condition_code: Optional[int]) -> bool:
-    cur.execute("SELECT id_internal FROM Orbit WHERE id_orbita = ?", orbit_id)
+                        orbit_uncertainty: Optional[int], condition_code: Optional[int],
+                        stage: Optional[list] = None, known_new: bool = False) -> bool:
     epoch_val = epoch if epoch is not None else (epoch_mjd if epoch_mjd is not None else None)
-    row = cur.fetchone()
+    # known_new=True quando o chamador ja sabe (via set pre-carregado) que a
+    # orbita nao existe: dispensa o SELECT de novidade por linha.
+    row = None
+    if not known_new:
+        cur.execute("SELECT id_internal FROM Orbit WHERE id_orbita = ?", orbit_id)
+        row = cur.fetchone()
     if row is not None:
         existing_id = row[0]
         if existing_id is not None and id_internal is not None and int(existing_id) != int(id_internal):
             print(f"[WARN] Orbit id {orbit_id} pertence a id_internal={existing_id}, skip update.")
             return False
-        cur.execute("""
-            UPDATE Orbit
-            SET epoch = COALESCE(epoch, ?),
-                rms = COALESCE(rms, ?),
-                moid_ld = COALESCE(moid_ld, ?),
-                epoch_mjd = COALESCE(epoch_mjd, ?),
-                epoch_cal = COALESCE(epoch_cal, ?),
-                tp = COALESCE(tp, ?),
-                tp_cal = COALESCE(tp_cal, ?),
-                per = COALESCE(per, ?),
-                per_y = COALESCE(per_y, ?),
-                equinox = CASE WHEN equinox IS NULL OR equinox = '' THEN NULLIF(?, '') ELSE equinox END,
-                orbit_uncertainty = COALESCE(orbit_uncertainty, ?),
-                condition_code = COALESCE(condition_code, ?),
-                e = COALESCE(e, ?),
-                a = COALESCE(a, ?),
-                q = COALESCE(q, ?),
-                i = COALESCE(i, ?),
-                om = COALESCE(om, ?),
-                w = COALESCE(w, ?),
-                ma = COALESCE(ma, ?),
-                ad = COALESCE(ad, ?),
-                n = COALESCE(n, ?),
-                moid = COALESCE(moid, ?),
-                sigma_e = COALESCE(sigma_e, ?),
-                sigma_a = COALESCE(sigma_a, ?),
-                sigma_q = COALESCE(sigma_q, ?),
-                sigma_i = COALESCE(sigma_i, ?),
-                sigma_n = COALESCE(sigma_n, ?),
-                sigma_ma = COALESCE(sigma_ma, ?),
-                sigma_om = COALESCE(sigma_om, ?),
-                sigma_w = COALESCE(sigma_w, ?),
-                sigma_ad = COALESCE(sigma_ad, ?),
-                sigma_tp = COALESCE(sigma_tp, ?),
-                sigma_per = COALESCE(sigma_per, ?),
-                id_internal = COALESCE(id_internal, ?),
-                class = CASE WHEN class IS NULL OR class = '' THEN NULLIF(?, '') ELSE class END
-            WHERE id_orbita = ?;
-        """,
+        cur.execute(_SQL_UPDATE_ORB,
         epoch_val,
         rms,
         moid_ld,
@@ -461,42 +838,28 @@ def insert_orbit_if_new(cur, orbit_id: str, id_internal: Optional[int], cls: str
     if tp_cal is None:
         tp_cal = epoch_cal if epoch_cal is not None else date.today()
 
-    cur.execute("""
-        INSERT INTO Orbit(
-          id_orbita, epoch, rms, moid_ld, epoch_mjd, epoch_cal,
-          tp, tp_cal, per, per_y, equinox,
-          orbit_uncertainty, condition_code,
-          e, a, q, i, om, w, ma, ad, n, moid,
-          sigma_e, sigma_a, sigma_q, sigma_i, sigma_n, sigma_ma, sigma_om, sigma_w, sigma_ad, sigma_tp, sigma_per,
-          id_internal, class
-        )
-        VALUES (
-          ?, ?, ?, ?, ?, ?,
-          ?, ?, ?, ?, ?,
-          ?, ?,
-          ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-          ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-          ?, ?
-        );
-    """,
-    orbit_id, (epoch_val if epoch_val is not None else 0.0), rms or 0.0, moid_ld or 0.0, epoch_mjd, epoch_cal,
-    tp or 0.0, tp_cal, per or 0.0, per_y or 0.0, equinox or "J2000",
-    orbit_uncertainty, condition_code,
-    e or 0.0, a or 0.0, q or 0.0, inc or 0.0, om or 0.0, w or 0.0, ma or 0.0, ad or 0.0, n or 0.0, moid or 0.0,
-    sigma_e, sigma_a, sigma_q, sigma_i, sigma_n, sigma_ma, sigma_om, sigma_w, sigma_ad, sigma_tp, sigma_per,
-    id_internal, cls
+    params = (
+        orbit_id, (epoch_val if epoch_val is not None else 0.0), rms or 0.0, moid_ld or 0.0, epoch_mjd, epoch_cal,
+        tp or 0.0, tp_cal, per or 0.0, per_y or 0.0, equinox or "J2000",
+        orbit_uncertainty, condition_code,
+        e or 0.0, a or 0.0, q or 0.0, inc or 0.0, om or 0.0, w or 0.0, ma or 0.0, ad or 0.0, n or 0.0, moid or 0.0,
+        sigma_e, sigma_a, sigma_q, sigma_i, sigma_n, sigma_ma, sigma_om, sigma_w, sigma_ad, sigma_tp, sigma_per,
+        id_internal, cls
     )
+    if stage is not None:
+        stage.append(params)
+    else:
+        cur.execute(_SQL_INSERT_ORB, *params)
     return True
 
 def load_neo_mpcorb_csv(conn: pyodbc.Connection, path: str) -> None:
-    encoding = detect_encoding(path)
-    header_line = read_header_line(path, encoding)
-    delim, header_fields = detect_delimiter_from_header(path, encoding)
+    encoding, header_line, sample_lines = probe_csv(path)
+    delim, header_fields = detect_delimiter_from_header(header_line)
     if not header_line:
         print("[ERRO] CSV vazio ou sem header legivel.")
         return
     if not delim:
-        delim = detect_delimiter(path, encoding)
+        delim = detect_delimiter(sample_lines)
         header_fields = parse_header_fields(header_line, delim)
     has_header = True
     if not header_fields or "id" not in header_fields or "spkid" not in header_fields:
@@ -507,51 +870,252 @@ def load_neo_mpcorb_csv(conn: pyodbc.Connection, path: str) -> None:
     header_fields = ensure_unique_header_fields(header_fields)
 
     cur = conn.cursor()
+    # Envia os parametros do executemany num unico RPC array em vez de
+    # sp_prepexec por linha (pyodbc).
+    cur.fast_executemany = True
+    # Suprime os pacotes TDS "N rows affected" por statement — num load de
+    # dezenas de milhares de INSERTs e trafego e processamento a menos, e
+    # nada aqui le cur.rowcount.
+    cur.execute("SET NOCOUNT ON;")
     ensure_reference_data(cur)
+    cur.execute(_SQL_CREATE_STG_ORB)
 
     neo_map, spk_map = load_existing_maps(cur)
-    next_id = get_next_id_internal(cur)
-    mpc_seq = get_next_mpc_seq(cur)
+    # Um unico SELECT materializa as orbitas existentes; o teste de novidade
+    # por linha passa a ser um lookup em set em vez de um SELECT.
+    cur.execute("SELECT id_orbita FROM Orbit")
+    existing_orbits = {r[0] for r in cur.fetchall()}
+    next_asteroid_id = make_seq_allocator(cur, "dbo.SeqAsteroidId", get_next_id_internal)
+    next_mpc_seq = make_seq_allocator(cur, "dbo.SeqMpcOrbit", get_next_mpc_seq)
 
     inserted_ast = updated_ast = inserted_orb = 0
     errors = 0
     missing_keys = 0
-    error_counts: Dict[str, int] = {}
+    # Classes ja vistas neste load: ~20 valores unicos num CSV de 30k linhas,
+    # nao vale a pena um round-trip IF NOT EXISTS por linha. As novas
+    # acumulam e entram todas num unico batch no flush.
+    seen_classes: Dict[str, str] = {}
+    pending_classes: list = []
+    error_counts: Counter = Counter()
     error_samples = []
-
-    with open(path, "r", encoding=encoding, errors="ignore", newline="") as f:
-        if has_header:
-            for line in f:
-                if line.strip():
-                    break
-            start_line_no = 2
-        else:
-            start_line_no = 1
-        reader = csv.DictReader(f, delimiter=delim, fieldnames=header_fields)
-
-        for line_no, row in enumerate(reader, start=start_line_no):
-            if not isinstance(row, dict):
-                continue
-
-            row = normalize_row_keys(row)
-
+    # Erros acumulam em memoria e entram na Load_Error num executemany por
+    # lote — um CSV mal formado deixa de custar um round-trip por linha ma.
+    pending_errors: list = []
+    has_error_table = table_exists(cur, "Load_Error")
+
+    # csv.reader + indices posicionais: evita construir um dict por linha
+    # (~70 hashes/linha com DictReader). O header ja esta normalizado, por
+    # isso o acesso por nome resolve-se uma vez para um offset inteiro.
+    col_idx = {name: i for i, name in enumerate(header_fields)}
+
+    # O produtor garante len(row) == len(header_fields), por isso o acesso
+    # posicional dispensa o teste de limites em cada uma das ~60 leituras/linha.
+    def cell(row: list, name: str, _idx=col_idx) -> Optional[str]:
+        i = _idx.get(name)
+        return row[i] if i is not None else None
+
+    # Especializacao ao layout detetado: os indices das 11 colunas sigma
+    # resolvem-se uma unica vez e o loop le posicionalmente, sem passar pelo
+    # acessor por nome.
+    sigma_idx = tuple(col_idx.get(c) for c in (
+        "sigma_e", "sigma_a", "sigma_q", "sigma_i", "sigma_om", "sigma_w",
+        "sigma_ma", "sigma_ad", "sigma_n", "sigma_tp", "sigma_per"))
+
+    # Presenca das colunas de alias resolvida uma vez por ficheiro: cada
+    # export traz ou o nome curto ou o longo, e sem este teste o fallback
+    # custava um lookup + parse de string vazia por linha mesmo quando a
+    # coluna nem existe no header.
+    (has_abs_mag, has_rms_residual, has_eccentricity, has_semi_major_axis,
+     has_inclination, has_long_asc_node, has_arg_perihelion, has_mean_anomaly,
+     has_mean_motion, has_epoch_mpc) = (
+        c in col_idx for c in (
+            "abs_mag", "rms_residual", "eccentricity", "semi_major_axis",
+            "inclination", "long_asc_node", "arg_perihelion", "mean_anomaly",
+            "mean_motion", "epoch_mpc"))
+
+    # Linhas novas ficam acumuladas e entram num unico executemany por lote:
+    # o custo dominante do load e o round-trip por INSERT, nao o parsing.
+    ast_batch: list = []
+    orb_batch: list = []
+    pending_new_ids: set = set()
+    pending_orbits: set = set()
+
+    def _executemany_isolated(sql: str, rows: list, entity: str, sizes: list) -> None:
+        # Uma linha ma nao deve matar o lote inteiro (nem o load): savepoint
+        # antes do executemany; se falhar, repoe e reinsere linha a linha
+        # para isolar a ofensora, que segue para o relatorio de erros como
+        # qualquer outra. O rollback fica confinado ao lote, nao a tudo o
+        # que ja foi carregado desde o ultimo commit.
+        cur.execute(_SQL_SAVE_BATCH)
+        # Tipos declarados a frente: o pyodbc salta a inferencia sobre o
+        # array de parametros. Limpa-se logo a seguir para nao afetar os
+        # restantes statements do cursor partilhado.
+        cur.setinputsizes(sizes)
+        try:
+            cur.executemany(sql, rows)
+            cur.setinputsizes(None)
+        except pyodbc.Error:
+            cur.setinputsizes(None)
+            cur.execute("ROLLBACK TRANSACTION sp_batch;")
+            _fallback_rows(sql, rows, entity)
+
+    def _fallback_rows(sql: str, rows: list, entity: str) -> None:
+        # Reexecucao linha a linha com um savepoint por linha, quando um
+        # lote inteiro falhou: isola as ofensoras, que seguem para o
+        # relatorio de erros, e deixa passar as restantes.
+        nonlocal errors
+        for r in rows:
+            cur.execute(_SQL_SAVE_ROW)
+            try:
+                cur.execute(sql, *r)
+            except pyodbc.Error as ex:
+                cur.execute("ROLLBACK TRANSACTION sp_row;")
+                errors += 1
+                error_counts[str(ex)] += 1
+                if has_error_table:
+                    pending_errors.append((path, 0, entity, f"Linha rejeitada no lote: {ex}", str(r)[:4000]))
+
+    def flush_class_batch():
+        # Classes num unico execute com os IF NOT EXISTS concatenados e os
+        # parametros pela ordem: um round-trip para todas em vez de um por
+        # classe. Com o mesmo isolamento dos lotes: uma classe ma repoe o
+        # savepoint e o resto entra uma a uma. Tambem e chamado sozinho
+        # antes de um UPDATE imediato de orbita que referencie uma classe
+        # ainda por flush (FK Class_Orbital).
+        if not pending_classes:
+            return
+        cur.execute(_SQL_SAVE_BATCH)
+        try:
+            cur.execute(
+                _SQL_UPSERT_CLASS * len(pending_classes),
+                *[p for tup in pending_classes for p in tup],
+            )
+        except pyodbc.Error:
+            cur.execute("ROLLBACK TRANSACTION sp_batch;")
+            _fallback_rows(_SQL_UPSERT_CLASS, pending_classes, "Class_Orbital")
+        pending_classes.clear()
+
+    def flush_batches():
+        # Classes primeiro (Orbit.class referencia Class_Orbital).
+        flush_class_batch()
+        # Asteroids primeiro: as orbitas referenciam id_internal.
+        if ast_batch:
+            _executemany_isolated(_SQL_INSERT_AST, ast_batch, "Asteroid", _SIZES_INSERT_AST)
+            ast_batch.clear()
+            pending_new_ids.clear()
+        if orb_batch:
+            _executemany_isolated(_SQL_INSERT_STG_ORB, orb_batch, "Orbit", _SIZES_INSERT_STG_ORB)
+            # O flush set-based tambem pode morrer por uma unica linha (ex.:
+            # orbita cujo asteroide foi rejeitado no lote acima -> FK de
+            # id_internal): savepoint, e em falha as orbitas staged passam
+            # uma a uma para isolar as ofensoras.
+            cur.execute(_SQL_SAVE_BATCH)
             try:
-                neo_id = norm_text(row.get("id"))
-                spkid = parse_int(row.get("spkid") or "")
-                orbit_id = norm_text(row.get("orbit_id"))
+                cur.execute(_SQL_FLUSH_STG_ORB)
+            except pyodbc.Error:
+                cur.execute("ROLLBACK TRANSACTION sp_batch;")
+                _fallback_rows(
+                    _SQL_FLUSH_STG_ORB_ONE,
+                    [(r[0], r[0]) for r in orb_batch],
+                    "Orbit",
+                )
+                # As rejeitadas ficaram na staging; limpa para o proximo lote.
+                cur.execute("DELETE FROM #stg_orbit;")
+            orb_batch.clear()
+            pending_orbits.clear()
+        if pending_errors:
+            cur.executemany(
+                "INSERT INTO Load_Error(source_file, row_number, entity, error_message, raw_data) VALUES (?, ?, ?, ?, ?)",
+                pending_errors
+            )
+            pending_errors.clear()
+
+    # Pipeline produtor/consumidor: uma thread le e faz parse do CSV enquanto
+    # esta trata da BD — a latencia de rede fica escondida atras do parse da
+    # proxima fatia (mesmo padrao queue+thread usado no resto da app).
+    parse_q: "queue.Queue" = queue.Queue(maxsize=4)
+    # Erro na thread leitora (ficheiro apagado/bloqueado entre a sonda e o
+    # load, OSError a meio): fica aqui guardado e e relancado depois do
+    # join, senao a thread morria em silencio e o load reportava sucesso
+    # com 0 linhas.
+    reader_error: list = []
+
+    def read_batches() -> None:
+        try:
+            # Buffer de 1 MiB: menos syscalls de leitura e blocos maiores para
+            # o decode, o mais proximo de IO em bloco que o parser de texto da.
+            with open(path, "r", encoding=encoding, errors="ignore", newline="", buffering=1 << 20) as f:
+                # Dica de leitura sequencial ao kernel: prefetch agressivo
+                # das paginas do ficheiro a frente do reader. Em plataformas
+                # sem fadvise (Windows) segue sem a dica.
+                try:
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except (AttributeError, OSError):
+                    pass
+                reader = csv.reader(f, delimiter=delim)
+                if has_header:
+                    # O header salta-se pelo proprio reader (parse em C),
+                    # sem o strip por linha do salto manual sobre o
+                    # ficheiro; linhas vazias iniciais vem como [] e
+                    # consomem-se ate ao header real.
+                    for skipped in reader:
+                        if skipped:
+                            break
+                    start_line_no = 2
+                else:
+                    start_line_no = 1
+                ncols = len(header_fields)
+                batch = []
+                for line_no, row in enumerate(reader, start=start_line_no):
+                    if row:
+                        if len(row) < ncols:
+                            row.extend([""] * (ncols - len(row)))
+                        batch.append((line_no, row))
+                        if len(batch) >= 1000:
+                            parse_q.put(batch)
+                            batch = []
+                if batch:
+                    parse_q.put(batch)
+        except Exception as ex:
+            reader_error.append(ex)
+        finally:
+            parse_q.put(None)
+
+    reader_t = threading.Thread(target=read_batches, daemon=True)
+    reader_t.start()
+
+    # Aliases locais das funcoes quentes: dentro do loop cada chamada
+    # resolve por LOAD_FAST em vez de LOAD_GLOBAL, e a diferenca
+    # acumula sobre as ~35 chamadas de parse por linha.
+    _pf, _pi, _pd = parse_float, parse_int, parse_date
+    _norm, _mpc_date = norm_text, mpc_packed_to_date
+
+    batches_done = 0
+    while True:
+        batch = parse_q.get()
+        if batch is None:
+            break
+        for line_no, row in batch:
+            try:
+                neo_id = _norm(cell(row, "id"))
+                spkid = _pi(cell(row, "spkid") or "")
+                orbit_id = _norm(cell(row, "orbit_id"))
                 neo_key = neo_id.lower() if neo_id else None
 
                 if not neo_id and spkid is None:
                     missing_keys += 1
 
-                cls = (row.get("class") or "").strip()
-                orbit_type = (row.get("orbit_type") or "").strip()
+                cls = (cell(row, "class") or "").strip()
+                orbit_type = (cell(row, "orbit_type") or "").strip()
                 if not cls and orbit_type:
                     cls = orbit_type[:20]
-                cls_desc = (row.get("class_description") or orbit_type or cls).strip()
-                upsert_class(cur, cls, cls_desc)
+                cls_desc = (cell(row, "class_description") or orbit_type or cls).strip()
+                if cls and cls not in seen_classes:
+                    seen_classes[cls] = cls_desc
+                    pending_classes.append((cls, cls, cls_desc or cls))
 
                 id_internal = None
+                is_new_ast = False
                 if neo_key:
                     if neo_key in neo_map:
                         id_internal = neo_map[neo_key]
@@ -559,8 +1123,8 @@ def load_neo_mpcorb_csv(conn: pyodbc.Connection, path: str) -> None:
                         id_internal = spk_map[spkid]
                         neo_map[neo_key] = id_internal
                     else:
-                        id_internal = next_id
-                        next_id += 1
+                        id_internal = next_asteroid_id()
+                        is_new_ast = True
                         neo_map[neo_key] = id_internal
                         if spkid is not None:
                             spk_map[spkid] = id_internal
@@ -568,105 +1132,120 @@ def load_neo_mpcorb_csv(conn: pyodbc.Connection, path: str) -> None:
                     if spkid in spk_map:
                         id_internal = spk_map[spkid]
                     else:
-                        id_internal = next_id
-                        next_id += 1
+                        id_internal = next_asteroid_id()
+                        is_new_ast = True
                         spk_map[spkid] = id_internal
 
-                neo_flag = ((row.get("neo") or "N").strip().upper()[:1] or "N")
-                pha_flag = ((row.get("pha") or "N").strip().upper()[:1] or "N")
-                if neo_flag not in ("Y", "N"):
-                    neo_flag = "N"
-                if pha_flag not in ("Y", "N"):
-                    pha_flag = "N"
+                neo_flag = _FLAG_MAP.get((cell(row, "neo") or "").strip()[:1], "N")
+                pha_flag = _FLAG_MAP.get((cell(row, "pha") or "").strip()[:1], "N")
 
-                designation = norm_text(row.get("designation")) or ""
-                designation_full = norm_text(row.get("designation_full")) or ""
-                full_name = norm_text(row.get("full_name"))
+                designation = _norm(cell(row, "designation")) or ""
+                designation_full = _norm(cell(row, "designation_full")) or ""
+                full_name = _norm(cell(row, "full_name"))
                 if not full_name:
                     full_name = (designation_full or designation or "UNKNOWN")[:100]
                 else:
                     full_name = full_name[:100]
-                pdes = norm_text(row.get("pdes"))
+                pdes = _norm(cell(row, "pdes"))
                 if not pdes:
                     pdes = (designation or designation_full or "UNKNOWN")[:50]
                 else:
                     pdes = pdes[:50]
-                name = norm_text(row.get("name"))
+                name = _norm(cell(row, "name"))
                 if name:
                     name = name[:100]
-                prefix = (norm_text(row.get("prefix")) or "")[:10]
-                h = parse_float(row.get("h") or "")
-                if h is None:
-                    h = parse_float(row.get("abs_mag") or "")
-                diameter = parse_float(row.get("diameter") or "")
-                albedo = parse_float(row.get("albedo") or "")
-                diameter_sigma = parse_float(row.get("diameter_sigma") or "")
+                prefix = (_norm(cell(row, "prefix")) or "")[:10]
+                h = _pf(cell(row, "h") or "")
+                if h is None and has_abs_mag:
+                    h = _pf(cell(row, "abs_mag") or "")
+                diameter = _pf(cell(row, "diameter") or "")
+                albedo = _pf(cell(row, "albedo") or "")
+                diameter_sigma = _pf(cell(row, "diameter_sigma") or "")
 
                 if id_internal is not None:
+                    if id_internal in pending_new_ids:
+                        # Duplicado dentro do proprio lote: o INSERT da
+                        # primeira ocorrencia ainda so esta em memoria, por
+                        # isso faz-se flush antecipado e a linha cai no
+                        # caminho normal de UPDATE, que funde os campos nao
+                        # nulos por COALESCE — os CSVs NEO+MPCORB fundidos
+                        # trazem duplicados complementares. Raro, o flush
+                        # extra nao pesa.
+                        flush_batches()
+                    # A decisao insert vs update vem dos mapas em memoria
+                    # (is_new_ast da resolucao do id acima), como as
+                    # orbitas ja fazem com known_new: zero SELECTs de
+                    # existencia no loop.
                     action = upsert_asteroid(
                         cur, id_internal, neo_id, spkid,
                         full_name, pdes, name, prefix,
                         neo_flag, pha_flag,
-                        diameter, h, albedo, diameter_sigma
+                        diameter, h, albedo, diameter_sigma,
+                        stage=ast_batch,
+                        known_new=is_new_ast,
+                        known_match=None if is_new_ast else (
+                            id_internal,
+                            "spk" if (spkid is not None and spk_map.get(spkid) == id_internal) else "neo",
+                        ),
                     )
                     if action == "insert":
+                        pending_new_ids.add(id_internal)
                         inserted_ast += 1
                     else:
                         updated_ast += 1
 
                 if not orbit_id:
-                    orbit_id = f"MPC{mpc_seq}"
-                    mpc_seq += 1
+                    orbit_id = f"MPC{next_mpc_seq()}"
 
                 if orbit_id:
-                    epoch = parse_float(row.get("epoch") or "")
-                    epoch_mjd = parse_float(row.get("epoch_mjd") or "")
-                    epoch_cal = parse_date(row.get("epoch_cal") or "")
-                    equinox = (row.get("equinox") or "J2000").strip()
+                    epoch = _pf(cell(row, "epoch") or "")
+                    epoch_mjd = _pf(cell(row, "epoch_mjd") or "")
+                    epoch_cal = _pd(cell(row, "epoch_cal") or "")
+                    equinox = (cell(row, "equinox") or "J2000").strip()
 
-                    epoch_mpc = (row.get("epoch_mpc") or "").strip()
+                    epoch_mpc = (cell(row, "epoch_mpc") or "").strip() if has_epoch_mpc else ""
                     if not epoch and not epoch_mjd and not epoch_cal and epoch_mpc:
-                        epoch_cal = mpc_packed_to_date(epoch_mpc)
+                        epoch_cal = _mpc_date(epoch_mpc)
                         if epoch_cal is not None:
                             epoch_mjd = date_to_mjd(epoch_cal)
                             epoch = epoch_mjd + 2400000.5
 
-                    rms = parse_float(row.get("rms") or "")
-                    if rms is None:
-                        rms = parse_float(row.get("rms_residual") or "")
-                    moid_ld = parse_float(row.get("moid_ld") or "")
-                    moid = parse_float(row.get("moid") or "")
-                    e = parse_float(row.get("e") or "")
-                    if e is None:
-                        e = parse_float(row.get("eccentricity") or "")
-                    a = parse_float(row.get("a") or "")
-                    if a is None:
-                        a = parse_float(row.get("semi_major_axis") or "")
-                    q = parse_float(row.get("q") or "")
+                    rms = _pf(cell(row, "rms") or "")
+                    if rms is None and has_rms_residual:
+                        rms = _pf(cell(row, "rms_residual") or "")
+                    moid_ld = _pf(cell(row, "moid_ld") or "")
+                    moid = _pf(cell(row, "moid") or "")
+                    e = _pf(cell(row, "e") or "")
+                    if e is None and has_eccentricity:
+                        e = _pf(cell(row, "eccentricity") or "")
+                    a = _pf(cell(row, "a") or "")
+                    if a is None and has_semi_major_axis:
+                        a = _pf(cell(row, "semi_major_axis") or "")
+                    q = _pf(cell(row, "q") or "")
                     if q is None and a is not None and e is not None:
                         q = a * (1.0 - e)
-                    inc = parse_float(row.get("i") or "")
-                    if inc is None:
-                        inc = parse_float(row.get("inclination") or "")
-                    om = parse_float(row.get("om") or "")
-                    if om is None:
-                        om = parse_float(row.get("long_asc_node") or "")
-                    w = parse_float(row.get("w") or "")
-                    if w is None:
-                        w = parse_float(row.get("arg_perihelion") or "")
-                    ma = parse_float(row.get("ma") or "")
-                    if ma is None:
-                        ma = parse_float(row.get("mean_anomaly") or "")
-                    ad = parse_float(row.get("ad") or "")
+                    inc = _pf(cell(row, "i") or "")
+                    if inc is None and has_inclination:
+                        inc = _pf(cell(row, "inclination") or "")
+                    om = _pf(cell(row, "om") or "")
+                    if om is None and has_long_asc_node:
+                        om = _pf(cell(row, "long_asc_node") or "")
+                    w = _pf(cell(row, "w") or "")
+                    if w is None and has_arg_perihelion:
+                        w = _pf(cell(row, "arg_perihelion") or "")
+                    ma = _pf(cell(row, "ma") or "")
+                    if ma is None and has_mean_anomaly:
+                        ma = _pf(cell(row, "mean_anomaly") or "")
+                    ad = _pf(cell(row, "ad") or "")
                     if ad is None and a is not None and e is not None:
                         ad = a * (1.0 + e)
-                    n = parse_float(row.get("n") or "")
-                    if n is None:
-                        n = parse_float(row.get("mean_motion") or "")
-                    tp = parse_float(row.get("tp") or "")
-                    tp_cal = parse_date(row.get("tp_cal") or "")
-                    per = parse_float(row.get("per") or "")
-                    per_y = parse_float(row.get("per_y") or "")
+                    n = _pf(cell(row, "n") or "")
+                    if n is None and has_mean_motion:
+                        n = _pf(cell(row, "mean_motion") or "")
+                    tp = _pf(cell(row, "tp") or "")
+                    tp_cal = _pd(cell(row, "tp_cal") or "")
+                    per = _pf(cell(row, "per") or "")
+                    per_y = _pf(cell(row, "per_y") or "")
                     if per is None and n:
                         per = 360.0 / n
                         per_y = per / 365.25 if per else None
@@ -680,20 +1259,25 @@ def load_neo_mpcorb_csv(conn: pyodbc.Connection, path: str) -> None:
                     if tp_cal is None:
                         tp_cal = epoch_cal if epoch_cal is not None else datetime.today().date()
 
-                    sigma_e = parse_float(row.get("sigma_e") or "")
-                    sigma_a = parse_float(row.get("sigma_a") or "")
-                    sigma_q = parse_float(row.get("sigma_q") or "")
-                    sigma_i = parse_float(row.get("sigma_i") or "")
-                    sigma_om = parse_float(row.get("sigma_om") or "")
-                    sigma_w = parse_float(row.get("sigma_w") or "")
-                    sigma_ma = parse_float(row.get("sigma_ma") or "")
-                    sigma_ad = parse_float(row.get("sigma_ad") or "")
-                    sigma_n = parse_float(row.get("sigma_n") or "")
-                    sigma_tp = parse_float(row.get("sigma_tp") or "")
-                    sigma_per = parse_float(row.get("sigma_per") or "")
-
-                    orbit_uncertainty = parse_int(row.get("uncertainty") or "")
-
+                    (sigma_e, sigma_a, sigma_q, sigma_i,
+                     sigma_om, sigma_w, sigma_ma, sigma_ad,
+                     sigma_n, sigma_tp, sigma_per) = (
+                        _pf(row[i]) if i is not None else None
+                        for i in sigma_idx)
+
+                    orbit_uncertainty = _pi(cell(row, "uncertainty") or "")
+
+                    if orbit_id in pending_orbits:
+                        # Duplicado no lote: flush antecipado e a orbita
+                        # segue pelo UPDATE por COALESCE do
+                        # insert_orbit_if_new, em vez de se perder a linha.
+                        flush_batches()
+                    elif orbit_id in existing_orbits and pending_classes:
+                        # Orbita existente vai direto ao UPDATE imediato,
+                        # que referencia class: uma classe vista pela
+                        # primeira vez neste lote ainda so esta em memoria
+                        # e violaria a FK Class_Orbital — entra primeiro.
+                        flush_class_batch()
                     inserted = insert_orbit_if_new(
                         cur, orbit_id, id_internal, cls,
                         epoch, epoch_mjd, epoch_cal, equinox,
@@ -703,22 +1287,38 @@ def load_neo_mpcorb_csv(conn: pyodbc.Connection, path: str) -> None:
                         sigma_e, sigma_a, sigma_q, sigma_i,
                         sigma_om, sigma_w, sigma_ma, sigma_ad,
                         sigma_n, sigma_tp, sigma_per,
-                        orbit_uncertainty, None
+                        orbit_uncertainty, None,
+                        stage=orb_batch,
+                        known_new=(orbit_id not in existing_orbits)
                     )
                     if inserted:
+                        pending_orbits.add(orbit_id)
+                        existing_orbits.add(orbit_id)
                         inserted_orb += 1
 
             except Exception as ex:
                 errors += 1
                 msg = str(ex)
-                error_counts[msg] = error_counts.get(msg, 0) + 1
+                error_counts[msg] += 1
                 if len(error_samples) < 5:
-                    error_samples.append((line_no, row.get("id"), row.get("spkid"), row.get("orbit_id"), msg))
-                log_error(cur, path, line_no, "Loader", f"Unhandled error: {ex}", str(row))
-
-            if (line_no % 1000) == 0:
-                conn.commit()
-
+                    error_samples.append((line_no, cell(row, "id"), cell(row, "spkid"), cell(row, "orbit_id"), msg))
+                if has_error_table:
+                    pending_errors.append((path, line_no, "Loader", f"Unhandled error: {ex}", str(row)[:4000]))
+        flush_batches()
+        batches_done += 1
+        # Cada COMMIT forca um flush duravel do log no SQL Server; a cada
+        # 1000 linhas esse fsync dominava o load. Commit a cada 50 lotes
+        # (~50k linhas) amortiza o custo sem deixar o log crescer sem limite;
+        # em caso de erro o close() do worker faz rollback do resto.
+        if batches_done % 50 == 0:
+            conn.commit()
+
+    reader_t.join()
+    if reader_error:
+        # O que ja foi carregado fica por confirmar: o worker apanha a
+        # excecao e o close() da ligacao descarta o resto, como em
+        # qualquer outro erro de load.
+        raise reader_error[0]
     conn.commit()
     cur.close()
 
@@ -740,12 +1340,15 @@ def load_neo_mpcorb_csv(conn: pyodbc.Connection, path: str) -> None:
     print("===============================\n")
 
 class QueueWriter(io.TextIOBase):
-    def __init__(self, q: "queue.Queue[str]") -> None:
+    def __init__(self, q: "queue.Queue[str]", notify=None) -> None:
         self.q = q
+        self.notify = notify
 
     def write(self, s: str) -> int:
         if s:
             self.q.put(s)
+            if self.notify is not None:
+                self.notify()
         return len(s)
 
     def flush(self) -> None:
@@ -841,9 +1444,80 @@ def run_gui() -> None:
     q_alerts: "queue.Queue[tuple[str, list]]" = queue.Queue()
     q_gen: "queue.Queue[tuple[str, str]]" = queue.Queue()
     q_monitor: "queue.Queue[tuple[str, object]]" = queue.Queue()
-    q_obs: "queue.Queue[tuple[str, Any]]" = queue.Queue()
+    # deque em vez de queue.Queue: com um so consumidor (thread do Tk) o
+    # append/popleft e atomico sob o GIL e dispensa o mutex por mensagem.
+    q_obs: "deque[tuple[str, Any]]" = deque()
     q_script: "queue.Queue[str]" = queue.Queue()
-    writer = QueueWriter(q)
+
+    # Executor partilhado para os workers de BD: evita criar uma thread por
+    # clique e limita a pressao sobre o servidor. O guard inflight colapsa
+    # cliques repetidos do mesmo botao enquanto o worker anterior corre.
+    db_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="neos-db")
+    inflight: set = set()
+
+    def submit_db(kind: str, fn) -> None:
+        if kind in inflight:
+            return
+        inflight.add(kind)
+
+        def run() -> None:
+            try:
+                fn()
+            finally:
+                inflight.discard(kind)
+
+        db_executor.submit(run)
+
+    # Acorda o poll do log por evento virtual em vez de depender so do timer:
+    # latencia sub-ms sob carga e zero trabalho quando nada chega. O Event
+    # evita inundar a fila de eventos do Tk com um wakeup por print.
+    log_wake_pending = threading.Event()
+
+    def wake_log_queue() -> None:
+        if not log_wake_pending.is_set():
+            log_wake_pending.set()
+            try:
+                root.event_generate("<<LoadLogMsg>>", when="tail")
+            except tk.TclError:
+                pass
+
+    writer = QueueWriter(q, notify=wake_log_queue)
+
+    # Mesmo padrao de entrega por evento para a fila de Observacoes: os
+    # workers publicam via post_obs e o Tk drena de imediato, sem o piso de
+    # latencia dos 200ms do poll.
+    obs_wake_pending = threading.Event()
+
+    def post_obs(item) -> None:
+        q_obs.append(item)
+        if not obs_wake_pending.is_set():
+            obs_wake_pending.set()
+            try:
+                root.event_generate("<<ObsMsg>>", when="tail")
+            except tk.TclError:
+                pass
+
+    # As restantes filas (alertas, geracao, monitor, script) seguem o mesmo
+    # padrao de entrega por evento virtual; a fabrica evita repetir o par
+    # Event+event_generate quatro vezes.
+    def make_poster(q_target: "queue.Queue", event_name: str):
+        pending = threading.Event()
+
+        def post(item: Any) -> None:
+            q_target.put(item)
+            if not pending.is_set():
+                pending.set()
+                try:
+                    root.event_generate(event_name, when="tail")
+                except tk.TclError:
+                    pass
+
+        return post, pending
+
+    post_alert, alert_wake_pending = make_poster(q_alerts, "<<AlertsMsg>>")
+    post_gen, gen_wake_pending = make_poster(q_gen, "<<GenMsg>>")
+    post_monitor, monitor_wake_pending = make_poster(q_monitor, "<<MonitorMsg>>")
+    post_script, script_wake_pending = make_poster(q_script, "<<ScriptMsg>>")
 
     var_server = tk.StringVar(value="")
     var_port = tk.StringVar(value="")
@@ -1006,14 +1680,30 @@ def run_gui() -> None:
     btn_frame.grid(row=2, column=0, sticky="we", padx=12, pady=6)
     btn_frame.columnconfigure(0, weight=1)
 
+    # Cada get() de StringVar e uma ida ao interpretador Tcl e todos os
+    # handlers comecam por ler os cinco campos. A cache invalida-se por
+    # trace quando qualquer campo muda; devolve-se uma copia porque alguns
+    # chamadores acrescentam chaves (p.ex. database=master).
+    cfg_cache: Dict[str, Any] = {"v": None}
+
     def cfg_from_fields() -> dict:
-        return {
-            "server": var_server.get().strip(),
-            "port": var_port.get().strip(),
-            "user": var_user.get().strip(),
-            "password": var_password.get(),
-            "database": var_database.get().strip(),
-        }
+        cfg = cfg_cache["v"]
+        if cfg is None:
+            cfg = {
+                "server": var_server.get().strip(),
+                "port": var_port.get().strip(),
+                "user": var_user.get().strip(),
+                "password": var_password.get(),
+                "database": var_database.get().strip(),
+            }
+            cfg_cache["v"] = cfg
+        return dict(cfg)
+
+    def invalidate_cfg_cache(*_args) -> None:
+        cfg_cache["v"] = None
+
+    for conn_var in (var_server, var_port, var_user, var_password, var_database):
+        conn_var.trace_add("write", invalidate_cfg_cache)
 
     def set_status(msg: str, ok: Optional[bool] = None) -> None:
         status_var.set(msg)
@@ -1167,33 +1857,49 @@ def run_gui() -> None:
                     load_neo_mpcorb_csv(conn, csv_path)
             except Exception as ex:
                 q.put(f"[ERRO] {ex}\n")
+                wake_log_queue()
             finally:
                 if conn:
                     conn.close()
                 q.put("__DONE__")
+                wake_log_queue()
 
         threading.Thread(target=worker, daemon=True).start()
 
     def poll_queue() -> None:
+        log_wake_pending.clear()
+        msgs = []
+        done = False
         try:
             while True:
                 msg = q.get_nowait()
                 if msg == "__DONE__":
-                    run_button.configure(state="normal")
-                    set_status("Processo concluido.", True)
-                    load_status_var.set("Processo concluido.")
-                    load_status_label.configure(style="TagOk.TLabel")
+                    done = True
                 else:
-                    output_text.configure(state="normal")
-                    output_text.insert("end", msg)
-                    output_text.see("end")
-                    output_text.configure(state="disabled")
-                    if msg.startswith("[ERRO]"):
-                        load_status_var.set("Erro no carregamento.")
-                        load_status_label.configure(style="TagBad.TLabel")
+                    msgs.append(msg)
         except queue.Empty:
             pass
-        root.after(100, poll_queue)
+        if msgs:
+            # Uma unica mutacao do widget por poll: inserir mensagem a
+            # mensagem forca um re-layout do Text por cada linha de log.
+            output_text.configure(state="normal")
+            output_text.insert("end", "".join(msgs))
+            # Mantem so as ultimas ~2000 linhas para o redraw nao crescer
+            # com a duracao do load.
+            if int(output_text.index("end-1c").split(".")[0]) > 2000:
+                output_text.delete("1.0", "end-2000l")
+            output_text.see("end")
+            output_text.configure(state="disabled")
+            if any(m.startswith("[ERRO]") for m in msgs):
+                load_status_var.set("Erro no carregamento.")
+                load_status_label.configure(style="TagBad.TLabel")
+        if done:
+            run_button.configure(state="normal")
+            set_status("Processo concluido.", True)
+            load_status_var.set("Processo concluido.")
+            load_status_label.configure(style="TagOk.TLabel")
+
+    root.bind("<<LoadLogMsg>>", lambda _e: poll_queue())
 
     ttk.Button(load_card, text="Escolher CSV", command=on_browse).grid(row=0, column=2, padx=10, pady=8)
     run_button = ttk.Button(load_actions, text="Atualizar BD", command=on_run, style="Accent.TButton")
@@ -1306,14 +2012,14 @@ def run_gui() -> None:
         def worker() -> None:
             try:
                 class_map, asteroids, orbits = gen_sql.build_data_from_csv(csv_path)
-                q_gen.put(("log", f"Classes: {len(class_map)} | Asteroides: {len(asteroids)} | Orbits: {len(orbits)}"))
+                post_gen(("log", f"Classes: {len(class_map)} | Asteroides: {len(asteroids)} | Orbits: {len(orbits)}"))
                 class_lines, asteroid_lines, orbit_lines = gen_sql.build_insert_blocks(class_map, asteroids, orbits)
                 gen_sql.write_sql_chunks(template_path, gen_sql.OUTPUT_DIR, class_lines, asteroid_lines, orbit_lines)
-                q_gen.put(("done", output_path))
+                post_gen(("done", output_path))
             except Exception as ex:
-                q_gen.put(("error", str(ex)))
+                post_gen(("error", str(ex)))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("run_generate_sql", worker)
 
     gen_button.configure(command=run_generate_sql)
 
@@ -1392,7 +2098,7 @@ def run_gui() -> None:
                 conn = connect(cfg)
                 conn.autocommit = True
                 cur = conn.cursor()
-                encoding = detect_encoding(script_path)
+                encoding, _, _ = probe_csv(script_path)
                 batch_count = 0
                 start_ts = time.time()
                 with open(script_path, "r", encoding=encoding, errors="ignore") as f:
@@ -1403,7 +2109,7 @@ def run_gui() -> None:
                             if batch:
                                 cur.execute(batch)
                                 batch_count += 1
-                                q_script.put(f"[INFO] Batch {batch_count} executado.")
+                                post_script(f"[INFO] Batch {batch_count} executado.")
                             buffer = []
                         else:
                             buffer.append(line)
@@ -1411,12 +2117,12 @@ def run_gui() -> None:
                     if tail:
                         cur.execute(tail)
                         batch_count += 1
-                        q_script.put(f"[INFO] Batch {batch_count} executado.")
+                        post_script(f"[INFO] Batch {batch_count} executado.")
                 conn.close()
                 elapsed = time.time() - start_ts
-                q_script.put(f"[OK] Script executado com sucesso. Batches: {batch_count}. Tempo: {elapsed:.1f}s")
+                post_script(f"[OK] Script executado com sucesso. Batches: {batch_count}. Tempo: {elapsed:.1f}s")
             except Exception as ex:
-                q_script.put(f"[ERRO] {ex}")
+                post_script(f"[ERRO] {ex}")
 
         threading.Thread(target=worker, daemon=True).start()
 
@@ -1736,16 +2442,17 @@ def run_gui() -> None:
         except ValueError:
             return None
 
-    def parse_datetime_text(value: str) -> Optional[datetime]:
-        v = value.strip()
-        if not v:
+    # Um match de regex compilada em vez de strptime em cadeia: cada formato
+    # falhado custava uma excecao inteira.
+    def parse_datetime_text(value: str, _re=re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})(?: (\d{1,2}):(\d{1,2}))?$")) -> Optional[datetime]:
+        m = _re.match(value.strip())
+        if not m:
+            return None
+        y, mo, d, hh, mm = m.groups()
+        try:
+            return datetime(int(y), int(mo), int(d), int(hh or 0), int(mm or 0))
+        except ValueError:
             return None
-        for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
-            try:
-                return datetime.strptime(v, fmt)
-            except ValueError:
-                pass
-        return None
 
     # Centros
     var_center_name = tk.StringVar(value="")
@@ -1932,6 +2639,8 @@ def run_gui() -> None:
     var_obs_software = tk.StringVar(value="")
     var_obs_equipment = tk.StringVar(value="")
     var_obs_filter = tk.StringVar(value="")
+    var_obs_page = tk.IntVar(value=1)
+    obs_has_more: dict = {"value": False}
 
     observation_layout = ttk.Frame(tab_observation)
     observation_layout.pack(fill="both", expand=True, padx=12, pady=12)
@@ -2010,7 +2719,24 @@ def run_gui() -> None:
     observation_scroll.place(in_=observation_tree, relx=1.0, rely=0, relheight=1.0, anchor="ne")
     observation_scroll_x = ttk.Scrollbar(observation_list, orient="horizontal", command=observation_tree.xview)
     observation_tree.configure(xscrollcommand=observation_scroll_x.set)
-    observation_scroll_x.pack(fill="x", padx=8, pady=(0, 8))
+    observation_scroll_x.pack(fill="x", padx=8, pady=(0, 2))
+
+    obs_pager = ttk.Frame(observation_list)
+    obs_pager.pack(fill="x", padx=8, pady=(0, 8))
+    obs_prev_btn = ttk.Button(
+        obs_pager,
+        text="◀ Anterior",
+        command=lambda: (var_obs_page.set(max(1, var_obs_page.get() - 1)), refresh_observations()),
+    )
+    obs_prev_btn.pack(side="left")
+    obs_page_label = ttk.Label(obs_pager, text="Página 1", style="Muted.TLabel")
+    obs_page_label.pack(side="left", padx=10)
+    obs_next_btn = ttk.Button(
+        obs_pager,
+        text="Seguinte ▶",
+        command=lambda: (var_obs_page.set(var_obs_page.get() + 1), refresh_observations()),
+    )
+    obs_next_btn.pack(side="left")
 
     def clear_obs_tree(tree: ttk.Treeview) -> None:
         for item in tree.get_children():
@@ -2021,23 +2747,23 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
                 cur.execute("SELECT id_center, name, location FROM Center_observation ORDER BY id_center;")
                 rows = cur.fetchall()
-                conn.close()
-                q_obs.put(("centers", rows))
+                release_conn(conn)
+                post_obs(("centers", rows))
             except Exception as ex:
-                q_obs.put(("error", f"Centros: {ex}"))
+                post_obs(("error", f"Centros: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("refresh_centers", worker)
 
     def refresh_equipments() -> None:
         cfg = cfg_from_fields()
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
                 cur.execute("""
                     SELECT e.id_equipment, e.tipo, e.modelo, COALESCE(c.name, '')
@@ -2046,44 +2772,44 @@ def run_gui() -> None:
                     ORDER BY e.id_equipment;
                 """)
                 rows = cur.fetchall()
-                conn.close()
-                q_obs.put(("equipments", rows))
+                release_conn(conn)
+                post_obs(("equipments", rows))
             except Exception as ex:
-                q_obs.put(("error", f"Equipamentos: {ex}"))
+                post_obs(("error", f"Equipamentos: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("refresh_equipments", worker)
 
     def refresh_software() -> None:
         cfg = cfg_from_fields()
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
                 cur.execute("SELECT id_software, version FROM Software_Obs ORDER BY id_software;")
                 rows = cur.fetchall()
-                conn.close()
-                q_obs.put(("software", rows))
+                release_conn(conn)
+                post_obs(("software", rows))
             except Exception as ex:
-                q_obs.put(("error", f"Software_Obs: {ex}"))
+                post_obs(("error", f"Software_Obs: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("refresh_software", worker)
 
     def refresh_astronomers() -> None:
         cfg = cfg_from_fields()
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
                 cur.execute("SELECT id_astronomer, name, affiliation FROM Astronomer ORDER BY id_astronomer;")
                 rows = cur.fetchall()
-                conn.close()
-                q_obs.put(("astronomers", rows))
+                release_conn(conn)
+                post_obs(("astronomers", rows))
             except Exception as ex:
-                q_obs.put(("error", f"Astrónomos: {ex}"))
+                post_obs(("error", f"Astrónomos: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("refresh_astronomers", worker)
 
     def refresh_asteroids() -> None:
         cfg = cfg_from_fields()
@@ -2094,7 +2820,7 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
                 cur.execute("""
                     SELECT
@@ -2112,12 +2838,12 @@ def run_gui() -> None:
                 has_more = len(rows) > page_size
                 if has_more:
                     rows = rows[:page_size]
-                conn.close()
-                q_obs.put(("asteroids", (rows, has_more, page)))
+                release_conn(conn)
+                post_obs(("asteroids", (rows, has_more, page)))
             except Exception as ex:
-                q_obs.put(("error", f"Asteroides: {ex}"))
+                post_obs(("error", f"Asteroides: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("refresh_asteroids", worker)
 
     def refresh_orbits() -> None:
         cfg = cfg_from_fields()
@@ -2128,7 +2854,7 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
                 cur.execute("""
                     SELECT
@@ -2146,35 +2872,42 @@ def run_gui() -> None:
                 has_more = len(rows) > page_size
                 if has_more:
                     rows = rows[:page_size]
-                conn.close()
-                q_obs.put(("orbits", (rows, has_more, page)))
+                release_conn(conn)
+                post_obs(("orbits", (rows, has_more, page)))
             except Exception as ex:
-                q_obs.put(("error", f"Órbitas: {ex}"))
+                post_obs(("error", f"Órbitas: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("refresh_orbits", worker)
 
     def refresh_observations(filter_text: Optional[str] = None) -> None:
         cfg = cfg_from_fields()
         text = (filter_text if filter_text is not None else var_obs_filter.get()).strip()
+        page = max(1, int(var_obs_page.get() or 1))
+        page_size = 200
+        offset = (page - 1) * page_size
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
+                # Data e fallback do nome ja formatados no SELECT: o loop de
+                # apresentacao fica sem strftime/hasattr por linha e o campo
+                # datetime viaja como texto curto.
                 base_sql = """
                     SELECT
                         id_observation,
-                        date,
+                        CONVERT(varchar(16), date, 120) AS date_txt,
                         duration,
                         mode,
                         id_internal,
-                        asteroid_name,
+                        COALESCE(NULLIF(asteroid_name, ''), CONCAT('ID ', id_internal)) AS asteroid_txt,
                         astronomer_name,
                         software_version,
                         equipment_name,
                         center_name
                     FROM vw_Observations_Detail
                 """
+                params: list = []
                 if text:
                     like = f"%{text}%"
                     base_sql += """
@@ -2186,25 +2919,50 @@ def run_gui() -> None:
                        OR equipment_name LIKE ?
                        OR mode LIKE ?
                     """
-                    base_sql += " ORDER BY date DESC;"
-                    cur.execute(base_sql, [like] * 7)
-                else:
-                    base_sql += " ORDER BY date DESC;"
-                    cur.execute(base_sql)
-                rows = cur.fetchall()
-                conn.close()
-                q_obs.put(("observations", rows))
+                    params = [like] * 7
+                # Paginacao no servidor como nas tabs de catalogo: cada
+                # refresh transfere no maximo uma pagina, seja qual for o
+                # tamanho da tabela. Pede-se page_size+1 para saber se ha mais.
+                base_sql += " ORDER BY date DESC OFFSET ? ROWS FETCH NEXT ? ROWS ONLY;"
+                params += [offset, page_size + 1]
+                cur.execute(base_sql, params)
+                # Em vez de materializar o fetchall completo, o resultado sai
+                # em blocos de 500 linhas: o Tk comeca a desenhar enquanto o
+                # SQL ainda esta a enviar e o pico de memoria fica em ~1x.
+                cur.arraysize = 500
+                post_obs(("observations_begin", None))
+                total = 0
+                has_more = False
+                while True:
+                    chunk = cur.fetchmany()
+                    if not chunk:
+                        break
+                    if total + len(chunk) > page_size:
+                        chunk = chunk[: page_size - total]
+                        has_more = True
+                    total += len(chunk)
+                    # A projecao para a Treeview faz-se ja aqui na thread de
+                    # BD; a thread do Tk limita-se a inserir os tuplos.
+                    post_obs(("observations_chunk", [
+                        (row[0], row[1], row[2], row[3], row[5],
+                         row[6], row[7], row[8], row[9])
+                        for row in chunk
+                    ]))
+                    if has_more:
+                        break
+                release_conn(conn)
+                post_obs(("observations_end", (total, has_more, page)))
             except Exception as ex:
-                q_obs.put(("error", f"Observações: {ex}"))
+                post_obs(("error", f"Observações: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("refresh_observations", worker)
 
     def refresh_images() -> None:
         cfg = cfg_from_fields()
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
                 cur.execute("""
                     SELECT
@@ -2219,44 +2977,99 @@ def run_gui() -> None:
                     ORDER BY capture_date DESC, id_image DESC;
                 """)
                 rows = cur.fetchall()
-                conn.close()
-                q_obs.put(("images", rows))
+                release_conn(conn)
+                post_obs(("images", rows))
             except Exception as ex:
-                q_obs.put(("error", f"Imagens: {ex}"))
+                post_obs(("error", f"Imagens: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("refresh_images", worker)
+
+    # As listas de referencia mudam raramente mas sao pedidas por varios
+    # botoes e depois de cada add_*; 30 s de validade evita repetir os
+    # SELECTs em eventos seguidos. Os add_* poem o ts a zero para forcar
+    # reload na proxima consulta.
+    refs_cache: Dict[str, Any] = {"ts": 0.0, "data": None}
+
+    # Snapshot das estatisticas do monitor: as contagens mudam devagar, por
+    # isso revisitar a tab dentro de 30 s nao repete a bateria de queries.
+    # Os adds que afetam contagens poem o ts a zero.
+    monitor_cache: Dict[str, Any] = {"ts": 0.0, "payload": None}
 
     def refresh_reference_lists() -> None:
         cfg = cfg_from_fields()
+        if refs_cache["data"] is not None and time.monotonic() - refs_cache["ts"] < 30.0:
+            post_obs(("refs", refs_cache["data"]))
+            post_obs(("log", "Listas carregadas (cache)."))
+            return
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
-                cur.execute("SELECT id_center, name FROM Center_observation ORDER BY id_center;")
+                # Um unico round-trip com quatro result sets em vez de quatro
+                # SELECTs sequenciais, cada um a pagar a latencia da rede.
+                cur.execute(
+                    "SET NOCOUNT ON;"
+                    "SELECT id_center, name FROM Center_observation ORDER BY id_center;"
+                    "SELECT id_equipment, tipo, modelo FROM Equipment ORDER BY id_equipment;"
+                    "SELECT id_software, version FROM Software_Obs ORDER BY id_software;"
+                    "SELECT id_astronomer, name FROM Astronomer ORDER BY id_astronomer;"
+                )
                 centers = cur.fetchall()
-                cur.execute("SELECT id_equipment, tipo, modelo FROM Equipment ORDER BY id_equipment;")
+                cur.nextset()
                 equipments = cur.fetchall()
-                cur.execute("SELECT id_software, version FROM Software_Obs ORDER BY id_software;")
+                cur.nextset()
                 softwares = cur.fetchall()
-                cur.execute("SELECT id_astronomer, name FROM Astronomer ORDER BY id_astronomer;")
+                cur.nextset()
                 astronomers = cur.fetchall()
-                conn.close()
-                q_obs.put(("refs", (centers, equipments, softwares, astronomers)))
-                q_obs.put(("log", "Listas carregadas."))
+                release_conn(conn)
+                # As strings dos combos montam-se aqui na thread de BD para a
+                # thread do Tk so ter de chamar configure(values=...).
+                refs_cache["data"] = (
+                    [f"{row[0]} - {row[1]}" for row in centers],
+                    [f"{row[0]} - {row[1]} {row[2]}" for row in equipments],
+                    [f"{row[0]} - {row[1]}" for row in softwares],
+                    [f"{row[0]} - {row[1]}" for row in astronomers],
+                )
+                refs_cache["ts"] = time.monotonic()
+                post_obs(("refs", refs_cache["data"]))
+                post_obs(("log", "Listas carregadas."))
             except Exception as ex:
-                q_obs.put(("error", f"Listas: {ex}"))
+                post_obs(("error", f"Listas: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("refresh_reference_lists", worker)
 
     obs_refresh_btn = ttk.Button(obs_actions, text="Carregar Listas", command=refresh_reference_lists)
     obs_refresh_btn.pack(side="right", padx=(0, 8))
 
-    ttk.Button(obs_filter_bar, text="Filtrar", command=refresh_observations).pack(side="left", padx=(0, 6))
+    # Prefetch das listas de referencia: ao entrar na tab de Observacoes as
+    # combos ja ficam povoadas, escondendo a latencia das quatro queries no
+    # tempo em que o utilizador ainda esta a olhar para o ecra. O TTL do
+    # refs_cache impede repeticoes; a tab so fica ativa depois de ligar.
+    def prefetch_refs_on_tab(_event: Any = None) -> None:
+        if notebook.select() == str(tab_obs) and time.monotonic() - refs_cache["ts"] >= 30.0:
+            refresh_reference_lists()
+
+    notebook.bind("<<NotebookTabChanged>>", prefetch_refs_on_tab, add="+")
+
+    def refs_background_refresh() -> None:
+        # So renova em fundo quando ja houve um carregamento com sucesso;
+        # antes de ligar nao ha nada para refrescar.
+        if refs_cache["data"] is not None and time.monotonic() - refs_cache["ts"] >= 30.0:
+            refresh_reference_lists()
+        root.after(60_000, refs_background_refresh)
+
+    root.after(60_000, refs_background_refresh)
+
+    ttk.Button(
+        obs_filter_bar,
+        text="Filtrar",
+        command=lambda: (var_obs_page.set(1), refresh_observations()),
+    ).pack(side="left", padx=(0, 6))
     ttk.Button(
         obs_filter_bar,
         text="Limpar",
-        command=lambda: (var_obs_filter.set(""), refresh_observations("")),
+        command=lambda: (var_obs_filter.set(""), var_obs_page.set(1), refresh_observations("")),
     ).pack(side="left")
 
     def add_center() -> None:
@@ -2269,26 +3082,21 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
-                cur.execute("SELECT ISNULL(MAX(id_center), 0) + 1 FROM Center_observation;")
-                row = cur.fetchone()
-                new_id = int(row[0] if row else 1)
-                cur.execute(
-                    "INSERT INTO Center_observation (id_center, name, location) VALUES (?, ?, ?);",
-                    new_id,
-                    name,
-                    location,
-                )
+                new_id = insert_with_new_id(
+                    cur, "Center_observation", "id_center",
+                    ("name", "location"), (name, location))
                 conn.commit()
-                conn.close()
-                q_obs.put(("log", f"Centro criado (ID {new_id})."))
-                q_obs.put(("refresh", "centers"))
-                q_obs.put(("refresh_refs", None))
+                release_conn(conn)
+                post_obs(("log", f"Centro criado (ID {new_id})."))
+                post_obs(("refresh", "centers"))
+                refs_cache["ts"] = 0.0
+                post_obs(("refresh_refs", None))
             except Exception as ex:
-                q_obs.put(("error", f"Centro: {ex}"))
+                post_obs(("error", f"Centro: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("add_center", worker)
 
     def add_equipment() -> None:
         tipo = var_equipment_tipo.get().strip()
@@ -2301,27 +3109,21 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
-                cur.execute("SELECT ISNULL(MAX(id_equipment), 0) + 1 FROM Equipment;")
-                row = cur.fetchone()
-                new_id = int(row[0] if row else 1)
-                cur.execute(
-                    "INSERT INTO Equipment (id_equipment, tipo, modelo, id_center) VALUES (?, ?, ?, ?);",
-                    new_id,
-                    tipo,
-                    modelo,
-                    center_id,
-                )
+                new_id = insert_with_new_id(
+                    cur, "Equipment", "id_equipment",
+                    ("tipo", "modelo", "id_center"), (tipo, modelo, center_id))
                 conn.commit()
-                conn.close()
-                q_obs.put(("log", f"Equipamento criado (ID {new_id})."))
-                q_obs.put(("refresh", "equipments"))
-                q_obs.put(("refresh_refs", None))
+                release_conn(conn)
+                post_obs(("log", f"Equipamento criado (ID {new_id})."))
+                post_obs(("refresh", "equipments"))
+                refs_cache["ts"] = 0.0
+                post_obs(("refresh_refs", None))
             except Exception as ex:
-                q_obs.put(("error", f"Equipamento: {ex}"))
+                post_obs(("error", f"Equipamento: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("add_equipment", worker)
 
     def add_software() -> None:
         version = var_software_version.get().strip()
@@ -2332,25 +3134,21 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
-                cur.execute("SELECT ISNULL(MAX(id_software), 0) + 1 FROM Software_Obs;")
-                row = cur.fetchone()
-                new_id = int(row[0] if row else 1)
-                cur.execute(
-                    "INSERT INTO Software_Obs (id_software, version) VALUES (?, ?);",
-                    new_id,
-                    version,
-                )
+                new_id = insert_with_new_id(
+                    cur, "Software_Obs", "id_software",
+                    ("version",), (version,))
                 conn.commit()
-                conn.close()
-                q_obs.put(("log", f"Software_Obs criado (ID {new_id})."))
-                q_obs.put(("refresh", "software"))
-                q_obs.put(("refresh_refs", None))
+                release_conn(conn)
+                post_obs(("log", f"Software_Obs criado (ID {new_id})."))
+                post_obs(("refresh", "software"))
+                refs_cache["ts"] = 0.0
+                post_obs(("refresh_refs", None))
             except Exception as ex:
-                q_obs.put(("error", f"Software_Obs: {ex}"))
+                post_obs(("error", f"Software_Obs: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("add_software", worker)
 
     def add_astronomer() -> None:
         name = var_astronomer_name.get().strip()
@@ -2362,26 +3160,21 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
-                cur.execute("SELECT ISNULL(MAX(id_astronomer), 0) + 1 FROM Astronomer;")
-                row = cur.fetchone()
-                new_id = int(row[0] if row else 1)
-                cur.execute(
-                    "INSERT INTO Astronomer (id_astronomer, name, affiliation) VALUES (?, ?, ?);",
-                    new_id,
-                    name,
-                    affiliation,
-                )
+                new_id = insert_with_new_id(
+                    cur, "Astronomer", "id_astronomer",
+                    ("name", "affiliation"), (name, affiliation))
                 conn.commit()
-                conn.close()
-                q_obs.put(("log", f"Astrónomo criado (ID {new_id})."))
-                q_obs.put(("refresh", "astronomers"))
-                q_obs.put(("refresh_refs", None))
+                release_conn(conn)
+                post_obs(("log", f"Astrónomo criado (ID {new_id})."))
+                post_obs(("refresh", "astronomers"))
+                refs_cache["ts"] = 0.0
+                post_obs(("refresh_refs", None))
             except Exception as ex:
-                q_obs.put(("error", f"Astrónomo: {ex}"))
+                post_obs(("error", f"Astrónomo: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("add_astronomer", worker)
 
     def add_asteroid() -> None:
         full_name = var_ast_full_name.get().strip()
@@ -2403,42 +3196,26 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
-                cur.execute("SELECT ISNULL(MAX(id_internal), 0) + 1 FROM Asteroid;")
-                row = cur.fetchone()
-                new_id = int(row[0] if row else 1)
-                cur.execute(
-                    """
-                    INSERT INTO Asteroid (
-                        id_internal, spkid, full_name, pdes, name, prefix,
-                        neo_flag, pha_flag, diameter, absolute_magnitude, albedo, diameter_sigma,
-                        created_at, neo_id
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, SYSDATETIME(), ?);
-                    """,
-                    new_id,
-                    spkid,
-                    full_name,
-                    pdes,
-                    name,
-                    prefix,
-                    neo_flag,
-                    pha_flag,
-                    diameter,
-                    abs_mag,
-                    albedo,
-                    diameter_sigma,
-                    neo_id,
-                )
+                new_id = insert_with_new_id(
+                    cur, "Asteroid", "id_internal",
+                    ("spkid", "full_name", "pdes", "name", "prefix",
+                     "neo_flag", "pha_flag", "diameter", "absolute_magnitude",
+                     "albedo", "diameter_sigma", "neo_id"),
+                    (spkid, full_name, pdes, name, prefix,
+                     neo_flag, pha_flag, diameter, abs_mag,
+                     albedo, diameter_sigma, neo_id),
+                    sql_cols=(("created_at", "SYSDATETIME()"),))
                 conn.commit()
-                conn.close()
-                q_obs.put(("log", f"Asteroide criado (ID {new_id})."))
-                q_obs.put(("refresh", "asteroids"))
+                release_conn(conn)
+                monitor_cache["ts"] = 0.0
+                post_obs(("log", f"Asteroide criado (ID {new_id})."))
+                post_obs(("refresh", "asteroids"))
             except Exception as ex:
-                q_obs.put(("error", f"Asteroide: {ex}"))
+                post_obs(("error", f"Asteroide: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("add_asteroid", worker)
 
     def add_orbit() -> None:
         orbit_id = var_orbit_id.get().strip()
@@ -2465,7 +3242,7 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
                 cur.execute(
                     """
@@ -2524,13 +3301,14 @@ def run_gui() -> None:
                     cls,
                 )
                 conn.commit()
-                conn.close()
-                q_obs.put(("log", f"Órbita criada ({orbit_id})."))
-                q_obs.put(("refresh", "orbits"))
+                release_conn(conn)
+                monitor_cache["ts"] = 0.0
+                post_obs(("log", f"Órbita criada ({orbit_id})."))
+                post_obs(("refresh", "orbits"))
             except Exception as ex:
-                q_obs.put(("error", f"Órbita: {ex}"))
+                post_obs(("error", f"Órbita: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("add_orbit", worker)
 
     def add_observation() -> None:
         date_val = parse_datetime_text(var_obs_date.get())
@@ -2550,35 +3328,23 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
-                cur.execute("SELECT ISNULL(MAX(id_observation), 0) + 1 FROM Observation;")
-                row = cur.fetchone()
-                new_id = int(row[0] if row else 1)
-                cur.execute(
-                    """
-                    INSERT INTO Observation (
-                        id_observation, date, duration, mode, id_internal, id_astronomer, id_software, id_equipment
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?);
-                    """,
-                    new_id,
-                    date_val,
-                    duration_val,
-                    mode_val,
-                    asteroid_id,
-                    astronomer_id,
-                    software_id,
-                    equipment_id,
-                )
+                new_id = insert_with_new_id(
+                    cur, "Observation", "id_observation",
+                    ("date", "duration", "mode", "id_internal",
+                     "id_astronomer", "id_software", "id_equipment"),
+                    (date_val, duration_val, mode_val, asteroid_id,
+                     astronomer_id, software_id, equipment_id))
                 conn.commit()
-                conn.close()
-                q_obs.put(("log", f"Observação criada (ID {new_id})."))
-                q_obs.put(("refresh", "observations"))
+                release_conn(conn)
+                monitor_cache["ts"] = 0.0
+                post_obs(("log", f"Observação criada (ID {new_id})."))
+                post_obs(("refresh", "observations"))
             except Exception as ex:
-                q_obs.put(("error", f"Observação: {ex}"))
+                post_obs(("error", f"Observação: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("add_observation", worker)
 
     def add_image() -> None:
         url = var_img_url.get().strip()
@@ -2593,33 +3359,20 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
-                cur.execute("SELECT ISNULL(MAX(id_image), 0) + 1 FROM Asteroid_Image;")
-                row = cur.fetchone()
-                new_id = int(row[0] if row else 1)
-                cur.execute(
-                    """
-                    INSERT INTO Asteroid_Image (
-                        id_image, image_url, source, capture_date, description, id_internal
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?);
-                    """,
-                    new_id,
-                    url,
-                    source,
-                    capture_date,
-                    description,
-                    asteroid_id,
-                )
+                new_id = insert_with_new_id(
+                    cur, "Asteroid_Image", "id_image",
+                    ("image_url", "source", "capture_date", "description", "id_internal"),
+                    (url, source, capture_date, description, asteroid_id))
                 conn.commit()
-                conn.close()
-                q_obs.put(("log", f"Imagem criada (ID {new_id})."))
-                q_obs.put(("refresh", "images"))
+                release_conn(conn)
+                post_obs(("log", f"Imagem criada (ID {new_id})."))
+                post_obs(("refresh", "images"))
             except Exception as ex:
-                q_obs.put(("error", f"Imagem: {ex}"))
+                post_obs(("error", f"Imagem: {ex}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("add_image", worker)
 
     ttk.Button(center_btns, text="Adicionar", command=add_center, style="Accent.TButton").grid(
         row=0, column=0, sticky="we", padx=4, pady=4
@@ -2683,153 +3436,188 @@ def run_gui() -> None:
         row=0, column=1, sticky="we", padx=4, pady=4
     )
 
+    # Posicao corrente do stream de observacoes (riscas alternadas entre blocos).
+    obs_stream: Dict[str, int] = {"idx": 0}
+
+    # Cada kind da fila tem o seu handler; o poll resolve por lookup O(1)
+    # no dict em vez de percorrer uma cadeia de comparacoes de strings por
+    # mensagem — com os streams por blocos o volume de mensagens subiu.
+    def _h_centers(payload: Any) -> None:
+        clear_obs_tree(center_tree)
+        for idx, row in enumerate(cast(list[tuple[Any, ...]], payload)):
+            insert_striped(center_tree, (row[0], row[1], row[2]), idx)
+
+    def _h_equipments(payload: Any) -> None:
+        clear_obs_tree(equipment_tree)
+        for idx, row in enumerate(cast(list[tuple[Any, ...]], payload)):
+            insert_striped(equipment_tree, (row[0], row[1], row[2], row[3]), idx)
+
+    def _h_software(payload: Any) -> None:
+        clear_obs_tree(software_tree)
+        for idx, row in enumerate(cast(list[tuple[Any, ...]], payload)):
+            insert_striped(software_tree, (row[0], row[1]), idx)
+
+    def _h_astronomers(payload: Any) -> None:
+        clear_obs_tree(astronomer_tree)
+        for idx, row in enumerate(cast(list[tuple[Any, ...]], payload)):
+            insert_striped(astronomer_tree, (row[0], row[1], row[2]), idx)
+
+    def _h_asteroids(payload: Any) -> None:
+        rows, has_more, page = cast(tuple[list[tuple[Any, ...]], bool, int], payload)
+        clear_obs_tree(asteroid_tree)
+        for idx, row in enumerate(rows):
+            created = row[5]
+            created_txt = created.strftime("%Y-%m-%d") if hasattr(created, "strftime") else str(created)
+            insert_striped(
+                asteroid_tree,
+                (row[0], row[1], row[2], row[3], row[4], created_txt),
+                idx,
+            )
+        ast_has_more["value"] = bool(has_more)
+        ast_page_label.configure(text=f"Página {page}")
+        ast_prev_btn.configure(state="normal" if page > 1 else "disabled")
+        ast_next_btn.configure(state="normal" if has_more else "disabled")
+
+    def _h_orbits(payload: Any) -> None:
+        rows, has_more, page = cast(tuple[list[tuple[Any, ...]], bool, int], payload)
+        clear_obs_tree(orbit_tree)
+        for idx, row in enumerate(rows):
+            insert_striped(orbit_tree, (row[0], row[1], row[2], row[3], row[4], row[5]), idx)
+        orbit_has_more["value"] = bool(has_more)
+        orbit_page_label.configure(text=f"Página {page}")
+        orbit_prev_btn.configure(state="normal" if page > 1 else "disabled")
+        orbit_next_btn.configure(state="normal" if has_more else "disabled")
+
+    def _h_observations_begin(_payload: Any) -> None:
+        clear_obs_tree(observation_tree)
+        obs_stream["idx"] = 0
+
+    def _h_observations_chunk(payload: Any) -> None:
+        # Os tuplos chegam ja na ordem das colunas da Treeview.
+        idx = obs_stream["idx"]
+        for vals in cast(list[tuple[Any, ...]], payload):
+            insert_striped(observation_tree, vals, idx)
+            idx += 1
+        obs_stream["idx"] = idx
+
+    def _h_observations_end(payload: Any) -> None:
+        count, has_more, page = cast(tuple[int, bool, int], payload)
+        obs_has_more["value"] = bool(has_more)
+        obs_page_label.configure(text=f"Página {page}")
+        obs_prev_btn.configure(state="normal" if page > 1 else "disabled")
+        obs_next_btn.configure(state="normal" if has_more else "disabled")
+        obs_status_var.set(f"{count} observações carregadas.")
+
+    def _h_images(payload: Any) -> None:
+        clear_obs_tree(images_tree)
+        for idx, row in enumerate(cast(list[tuple[Any, ...]], payload)):
+            capture = row[3]
+            capture_txt = capture.strftime("%Y-%m-%d") if hasattr(capture, "strftime") else (capture or "")
+            insert_striped(
+                images_tree,
+                (
+                    row[0],
+                    row[1],
+                    row[2],
+                    capture_txt,
+                    row[4],
+                    row[5],
+                    row[6],
+                ),
+                idx,
+            )
+
+    def _h_refs(payload: Any) -> None:
+        center_values, equipment_values, software_values, astronomer_values = cast(
+            tuple[list[str], list[str], list[str], list[str]],
+            payload,
+        )
+        equipment_center_combo.configure(values=center_values)
+        obs_equipment_combo.configure(values=equipment_values)
+        obs_software_combo.configure(values=software_values)
+        obs_astronomer_combo.configure(values=astronomer_values)
+        if var_equipment_center.get() not in center_values:
+            var_equipment_center.set(center_values[0] if center_values else "")
+        if var_obs_equipment.get() not in equipment_values:
+            var_obs_equipment.set(equipment_values[0] if equipment_values else "")
+        if var_obs_software.get() not in software_values:
+            var_obs_software.set(software_values[0] if software_values else "")
+        if var_obs_astronomer.get() not in astronomer_values:
+            var_obs_astronomer.set(astronomer_values[0] if astronomer_values else "")
+
+    refresh_actions = {
+        "centers": refresh_centers,
+        "equipments": refresh_equipments,
+        "software": refresh_software,
+        "astronomers": refresh_astronomers,
+        "asteroids": lambda: (var_ast_page.set(1), refresh_asteroids()),
+        "orbits": lambda: (var_orbit_page.set(1), refresh_orbits()),
+        "observations": lambda: (var_obs_page.set(1), refresh_observations()),
+        "images": refresh_images,
+    }
+
+    def _h_refresh(payload: Any) -> None:
+        action = refresh_actions.get(cast(str, payload))
+        if action:
+            action()
+
+    def _h_refresh_refs(_payload: Any) -> None:
+        refresh_reference_lists()
+
+    def _h_log(payload: Any) -> None:
+        obs_status_var.set(str(payload))
+
+    def _h_error(payload: Any) -> None:
+        obs_status_var.set(str(payload))
+        messagebox.showerror("Observações", str(payload))
+
+    def _h_view_rows(payload: Any) -> None:
+        columns, rows = cast(tuple[list[str], list[tuple[Any, ...]]], payload)
+        views_tree.configure(columns=columns)
+        for col in columns:
+            views_tree.heading(col, text=col)
+            views_tree.column(col, width=140, anchor="w")
+        clear_view_tree()
+        for idx, row in enumerate(rows):
+            insert_striped(views_tree, tuple(row), idx)
+        views_status.configure(text=f"{len(rows)} linhas", style="TagOk.TLabel")
+
+    def _h_view_error(payload: Any) -> None:
+        views_status.configure(text="Erro a carregar", style="TagBad.TLabel")
+        messagebox.showerror("Views", str(payload))
+
+    obs_handlers = {
+        "centers": _h_centers,
+        "equipments": _h_equipments,
+        "software": _h_software,
+        "astronomers": _h_astronomers,
+        "asteroids": _h_asteroids,
+        "orbits": _h_orbits,
+        "observations_begin": _h_observations_begin,
+        "observations_chunk": _h_observations_chunk,
+        "observations_end": _h_observations_end,
+        "images": _h_images,
+        "refs": _h_refs,
+        "refresh": _h_refresh,
+        "refresh_refs": _h_refresh_refs,
+        "log": _h_log,
+        "error": _h_error,
+        "view_rows": _h_view_rows,
+        "view_error": _h_view_error,
+    }
+
     def poll_obs_queue() -> None:
+        obs_wake_pending.clear()
         try:
             while True:
-                kind, payload = q_obs.get_nowait()
-                if kind == "centers":
-                    clear_obs_tree(center_tree)
-                    for idx, row in enumerate(cast(list[tuple[Any, ...]], payload)):
-                        insert_striped(center_tree, (row[0], row[1], row[2]), idx)
-                elif kind == "equipments":
-                    clear_obs_tree(equipment_tree)
-                    for idx, row in enumerate(cast(list[tuple[Any, ...]], payload)):
-                        insert_striped(equipment_tree, (row[0], row[1], row[2], row[3]), idx)
-                elif kind == "software":
-                    clear_obs_tree(software_tree)
-                    for idx, row in enumerate(cast(list[tuple[Any, ...]], payload)):
-                        insert_striped(software_tree, (row[0], row[1]), idx)
-                elif kind == "astronomers":
-                    clear_obs_tree(astronomer_tree)
-                    for idx, row in enumerate(cast(list[tuple[Any, ...]], payload)):
-                        insert_striped(astronomer_tree, (row[0], row[1], row[2]), idx)
-                elif kind == "asteroids":
-                    rows, has_more, page = cast(tuple[list[tuple[Any, ...]], bool, int], payload)
-                    clear_obs_tree(asteroid_tree)
-                    for idx, row in enumerate(rows):
-                        created = row[5]
-                        created_txt = created.strftime("%Y-%m-%d") if hasattr(created, "strftime") else str(created)
-                        insert_striped(
-                            asteroid_tree,
-                            (row[0], row[1], row[2], row[3], row[4], created_txt),
-                            idx,
-                        )
-                    ast_has_more["value"] = bool(has_more)
-                    ast_page_label.configure(text=f"Página {page}")
-                    ast_prev_btn.configure(state="normal" if page > 1 else "disabled")
-                    ast_next_btn.configure(state="normal" if has_more else "disabled")
-                elif kind == "orbits":
-                    rows, has_more, page = cast(tuple[list[tuple[Any, ...]], bool, int], payload)
-                    clear_obs_tree(orbit_tree)
-                    for idx, row in enumerate(rows):
-                        insert_striped(orbit_tree, (row[0], row[1], row[2], row[3], row[4], row[5]), idx)
-                    orbit_has_more["value"] = bool(has_more)
-                    orbit_page_label.configure(text=f"Página {page}")
-                    orbit_prev_btn.configure(state="normal" if page > 1 else "disabled")
-                    orbit_next_btn.configure(state="normal" if has_more else "disabled")
-                elif kind == "observations":
-                    clear_obs_tree(observation_tree)
-                    for idx, row in enumerate(cast(list[tuple[Any, ...]], payload)):
-                        date_val = row[1]
-                        date_txt = date_val.strftime("%Y-%m-%d %H:%M") if hasattr(date_val, "strftime") else str(date_val)
-                        asteroid_txt = row[5] if row[5] else f"ID {row[4]}"
-                        equipment_txt = row[8]
-                        insert_striped(
-                            observation_tree,
-                            (
-                                row[0],
-                                date_txt,
-                                row[2],
-                                row[3],
-                                asteroid_txt,
-                                row[6],
-                                row[7],
-                                equipment_txt,
-                                row[9],
-                            ),
-                            idx,
-                        )
-                elif kind == "images":
-                    clear_obs_tree(images_tree)
-                    for idx, row in enumerate(cast(list[tuple[Any, ...]], payload)):
-                        capture = row[3]
-                        capture_txt = capture.strftime("%Y-%m-%d") if hasattr(capture, "strftime") else (capture or "")
-                        insert_striped(
-                            images_tree,
-                            (
-                                row[0],
-                                row[1],
-                                row[2],
-                                capture_txt,
-                                row[4],
-                                row[5],
-                                row[6],
-                            ),
-                            idx,
-                        )
-                elif kind == "refs":
-                    centers, equipments, softwares, astronomers = cast(
-                        tuple[list[tuple[Any, ...]], list[tuple[Any, ...]], list[tuple[Any, ...]], list[tuple[Any, ...]]],
-                        payload,
-                    )
-                    center_values = [f"{row[0]} - {row[1]}" for row in centers]
-                    equipment_values = [f"{row[0]} - {row[1]} {row[2]}" for row in equipments]
-                    software_values = [f"{row[0]} - {row[1]}" for row in softwares]
-                    astronomer_values = [f"{row[0]} - {row[1]}" for row in astronomers]
-                    equipment_center_combo.configure(values=center_values)
-                    obs_equipment_combo.configure(values=equipment_values)
-                    obs_software_combo.configure(values=software_values)
-                    obs_astronomer_combo.configure(values=astronomer_values)
-                    if var_equipment_center.get() not in center_values:
-                        var_equipment_center.set(center_values[0] if center_values else "")
-                    if var_obs_equipment.get() not in equipment_values:
-                        var_obs_equipment.set(equipment_values[0] if equipment_values else "")
-                    if var_obs_software.get() not in software_values:
-                        var_obs_software.set(software_values[0] if software_values else "")
-                    if var_obs_astronomer.get() not in astronomer_values:
-                        var_obs_astronomer.set(astronomer_values[0] if astronomer_values else "")
-                elif kind == "refresh":
-                    if payload == "centers":
-                        refresh_centers()
-                    elif payload == "equipments":
-                        refresh_equipments()
-                    elif payload == "software":
-                        refresh_software()
-                    elif payload == "astronomers":
-                        refresh_astronomers()
-                    elif payload == "asteroids":
-                        var_ast_page.set(1)
-                        refresh_asteroids()
-                    elif payload == "orbits":
-                        var_orbit_page.set(1)
-                        refresh_orbits()
-                    elif payload == "observations":
-                        refresh_observations()
-                    elif payload == "images":
-                        refresh_images()
-                elif kind == "refresh_refs":
-                    refresh_reference_lists()
-                elif kind == "log":
-                    obs_status_var.set(str(payload))
-                elif kind == "error":
-                    obs_status_var.set(str(payload))
-                    messagebox.showerror("Observações", str(payload))
-                elif kind == "view_rows":
-                    columns, rows = cast(tuple[list[str], list[tuple[Any, ...]]], payload)
-                    views_tree.configure(columns=columns)
-                    for col in columns:
-                        views_tree.heading(col, text=col)
-                        views_tree.column(col, width=140, anchor="w")
-                    clear_view_tree()
-                    for idx, row in enumerate(rows):
-                        insert_striped(views_tree, tuple(row), idx)
-                    views_status.configure(text=f"{len(rows)} linhas", style="TagOk.TLabel")
-                elif kind == "view_error":
-                    views_status.configure(text="Erro a carregar", style="TagBad.TLabel")
-                    messagebox.showerror("Views", str(payload))
-        except queue.Empty:
+                kind, payload = q_obs.popleft()
+                handler = obs_handlers.get(kind)
+                if handler:
+                    handler(payload)
+        except IndexError:
             pass
-        root.after(200, poll_obs_queue)
+
+    root.bind("<<ObsMsg>>", lambda _e: poll_obs_queue())
 
     # Tab Views
     views_header = ttk.Frame(tab_views)
@@ -2897,17 +3685,17 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
                 cur.execute(f"SELECT * FROM {view_name};")
                 rows = cur.fetchall()
                 columns = [col[0] for col in cur.description] if cur.description else []
-                conn.close()
-                q_obs.put(("view_rows", (columns, rows)))
+                release_conn(conn)
+                post_obs(("view_rows", (columns, rows)))
             except Exception as ex:
-                q_obs.put(("view_error", str(ex)))
+                post_obs(("view_error", str(ex)))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("load_view_data", worker)
 
     ttk.Button(views_controls, text="Carregar View", command=load_view_data, style="Accent.TButton").grid(
         row=0, column=3, sticky="e", padx=10, pady=8
@@ -3049,9 +3837,16 @@ def run_gui() -> None:
     trend_cache: dict = {"precision": ([], []), "discovery": ([], [])}
 
     def draw_line_chart(canvas: tk.Canvas, labels: list, values: list) -> None:
-        canvas.delete("all")
         w = canvas.winfo_width() or 400
         h = canvas.winfo_height() or 140
+        # Os <Configure> e trocas de tab redesenham com os mesmos dados e
+        # tamanho na maioria das vezes; se nada mudou, o desenho anterior
+        # continua valido.
+        sig = (tuple(labels), tuple(values), w, h)
+        if getattr(canvas, "_last_sig", None) == sig:
+            return
+        canvas._last_sig = sig
+        canvas.delete("all")
         pad = 28
         if not values:
             canvas.create_text(w / 2, h / 2, text="Sem dados", fill="#666666")
@@ -3067,8 +3862,10 @@ def run_gui() -> None:
             points.append((x, y))
         canvas.create_line(pad, h - pad, w - pad, h - pad, fill="#bbbbbb")
         canvas.create_line(pad, pad, pad, h - pad, fill="#bbbbbb")
-        for i in range(1, len(points)):
-            canvas.create_line(points[i - 1][0], points[i - 1][1], points[i][0], points[i][1], fill="#2b6cb0", width=2)
+        # Uma chamada Tcl para a linha toda em vez de uma por segmento.
+        if len(points) > 1:
+            flat = [c for p in points for c in p]
+            canvas.create_line(*flat, fill="#2b6cb0", width=2)
         for x, y in points:
             canvas.create_oval(x - 2, y - 2, x + 2, y + 2, fill="#2b6cb0", outline="")
         canvas.create_text(pad, pad - 8, text=f"{max_v:.3f}" if isinstance(max_v, float) else str(max_v), anchor="w", fill="#666666")
@@ -3082,68 +3879,105 @@ def run_gui() -> None:
         draw_line_chart(discovery_canvas, trend_cache["discovery"][0], trend_cache["discovery"][1])
 
     def refresh_monitor() -> None:
+        if monitor_cache["payload"] is not None and time.monotonic() - monitor_cache["ts"] < 30.0:
+            post_monitor(("stats", monitor_cache["payload"]))
+            return
         cfg = cfg_from_fields()
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
-                cur.execute("""
-                    SELECT total_asteroids, total_orbits, total_alerts, high_alerts
-                    FROM vw_Monitor_Stats;
-                """)
+                # As oito views do monitor seguem num unico batch; os result
+                # sets leem-se por nextset(). Numa BD remota isto reduz o
+                # refresh de oito latencias de rede para uma.
+                cur.execute(
+                    "SET NOCOUNT ON;"
+                    "SELECT total_asteroids, total_orbits, total_alerts, high_alerts FROM vw_Monitor_Stats;"
+                    "SELECT red_alerts, orange_alerts FROM vw_Alert_Stats;"
+                    "SELECT pha_over_100 FROM vw_PHA_Over100;"
+                    "SELECT next_close_approach_date FROM vw_Next_Critical_Event;"
+                    "SELECT new_neos_last_month FROM vw_New_NEOs_LastMonth;"
+                    "SELECT TOP 12 yr, cnt, avg_rms FROM vw_RMS_Trend ORDER BY yr DESC;"
+                    "SELECT TOP 12 period, cnt FROM vw_Discovery_Trend ORDER BY period DESC;"
+                    "SELECT id_internal, full_name, created_at FROM vw_LatestAsteroids;"
+                )
                 row = cur.fetchone()
                 ast_count = int(row[0] if row and row[0] is not None else 0)
                 orbit_count = int(row[1] if row and row[1] is not None else 0)
                 alert_count = int(row[2] if row and row[2] is not None else 0)
                 high_count = int(row[3] if row and row[3] is not None else 0)
 
-                cur.execute("SELECT red_alerts, orange_alerts FROM vw_Alert_Stats;")
+                cur.nextset()
                 row = cur.fetchone()
                 red_count = int(row[0] if row and row[0] is not None else 0)
                 orange_count = int(row[1] if row and row[1] is not None else 0)
 
-                cur.execute("SELECT pha_over_100 FROM vw_PHA_Over100;")
+                cur.nextset()
                 row = cur.fetchone()
                 pha_over = int(row[0] if row and row[0] is not None else 0)
 
-                cur.execute("SELECT next_close_approach_date FROM vw_Next_Critical_Event;")
+                cur.nextset()
                 row = cur.fetchone()
                 next_critical = row[0] if row else None
 
-                cur.execute("SELECT new_neos_last_month FROM vw_New_NEOs_LastMonth;")
+                cur.nextset()
                 row = cur.fetchone()
                 new_neos = int(row[0] if row and row[0] is not None else 0)
 
-                cur.execute("""
-                    SELECT TOP 12 yr, cnt, avg_rms
-                    FROM vw_RMS_Trend
-                    ORDER BY yr DESC;
-                """)
+                cur.nextset()
                 precision_rows = cur.fetchall()
 
-                cur.execute("""
-                    SELECT TOP 12 period, cnt
-                    FROM vw_Discovery_Trend
-                    ORDER BY period DESC;
-                """)
+                cur.nextset()
                 discovery_rows = cur.fetchall()
 
-                cur.execute("""
-                    SELECT id_internal, full_name, created_at
-                    FROM vw_LatestAsteroids;
-                """)
+                cur.nextset()
                 latest_rows = cur.fetchall()
-                conn.close()
-
-                q_monitor.put((
-                    "stats",
-                    (ast_count, orbit_count, alert_count, high_count, red_count, orange_count, pha_over, new_neos, next_critical, precision_rows, discovery_rows, latest_rows),
-                ))
+                release_conn(conn)
+
+                # As linhas das tres arvores e as series dos graficos ficam
+                # prontas aqui; o update_monitor so insere e desenha.
+                precision_fmt = []
+                precision_labels = []
+                precision_vals = []
+                for yr, cnt, avg_rms in precision_rows:
+                    precision_fmt.append((yr, cnt, f"{avg_rms:.4f}" if avg_rms is not None else "-"))
+                    precision_labels.append(str(yr))
+                    precision_vals.append(avg_rms if avg_rms is not None else 0.0)
+                discovery_fmt = []
+                discovery_labels = []
+                discovery_vals = []
+                for period, cnt in discovery_rows:
+                    discovery_fmt.append((period, cnt))
+                    discovery_labels.append(str(period))
+                    discovery_vals.append(float(cnt))
+                # As series dos graficos seguem ja em ordem cronologica;
+                # o update_monitor usa-as tal como estao, sem alocar
+                # listas invertidas na thread do Tk.
+                precision_labels.reverse()
+                precision_vals.reverse()
+                discovery_labels.reverse()
+                discovery_vals.reverse()
+                latest_fmt = [
+                    (row[0], row[1],
+                     row[2].strftime("%Y-%m-%d") if hasattr(row[2], "strftime") else str(row[2]))
+                    for row in latest_rows
+                ]
+
+                payload = (
+                    ast_count, orbit_count, alert_count, high_count,
+                    red_count, orange_count, pha_over, new_neos, next_critical,
+                    (precision_fmt, precision_labels, precision_vals),
+                    (discovery_fmt, discovery_labels, discovery_vals),
+                    latest_fmt,
+                )
+                monitor_cache["payload"] = payload
+                monitor_cache["ts"] = time.monotonic()
+                post_monitor(("stats", payload))
             except Exception as ex:
-                q_monitor.put(("error", str(ex)))
+                post_monitor(("error", str(ex)))
 
-        threading.Thread(target=worker, daemon=True).start()
+        submit_db("refresh_monitor", worker)
 
     def update_monitor(payload: Tuple[Any, Any, Any, Any, Any, Any, Any, Any, Any, Any, Any, Any]) -> None:
         (
@@ -3156,56 +3990,55 @@ def run_gui() -> None:
             pha_over,
             new_neos,
             next_critical,
-            precision_rows,
-            discovery_rows,
+            precision_data,
+            discovery_data,
             latest_rows,
         ) = payload
-        var_ast.set(str(ast_count))
-        var_orbit.set(str(orbit_count))
-        var_alert.set(str(alert_count))
-        var_high.set(str(high_count))
-        var_red.set(str(red_count))
-        var_orange.set(str(orange_count))
-        var_pha_over.set(str(pha_over))
-        var_new_neos.set(str(new_neos))
         if next_critical:
-            var_next_critical.set(
-                next_critical.strftime("%Y-%m-%d") if hasattr(next_critical, "strftime") else str(next_critical)
-            )
+            next_txt = next_critical.strftime("%Y-%m-%d") if hasattr(next_critical, "strftime") else str(next_critical)
         else:
-            var_next_critical.set("-")
+            next_txt = "-"
+        # As nove StringVars do topo seguem num unico eval em vez de nove
+        # travessias Python->Tcl. Os valores sao contagens e uma data curta,
+        # por isso a citacao por chavetas chega.
+        root.tk.eval("; ".join(
+            f"set {var._name} {{{val}}}"  # type: ignore[attr-defined]
+            for var, val in (
+                (var_ast, ast_count),
+                (var_orbit, orbit_count),
+                (var_alert, alert_count),
+                (var_high, high_count),
+                (var_red, red_count),
+                (var_orange, orange_count),
+                (var_pha_over, pha_over),
+                (var_new_neos, new_neos),
+                (var_next_critical, next_txt),
+            )
+        ))
+
+        precision_fmt, precision_labels, precision_vals = precision_data
+        discovery_fmt, discovery_labels, discovery_vals = discovery_data
 
         clear_tree(precision_tree)
-        precision_labels = []
-        precision_vals = []
-        for idx, row in enumerate(precision_rows):
-            yr, cnt, avg_rms = row
-            avg_txt = f"{avg_rms:.4f}" if avg_rms is not None else "-"
-            insert_striped(precision_tree, (yr, cnt, avg_txt), idx)
-            precision_labels.append(str(yr))
-            precision_vals.append(avg_rms if avg_rms is not None else 0.0)
+        for idx, vals in enumerate(precision_fmt):
+            insert_striped(precision_tree, vals, idx)
 
         clear_tree(discovery_tree)
-        discovery_labels = []
-        discovery_vals = []
-        for idx, row in enumerate(discovery_rows):
-            insert_striped(discovery_tree, (row[0], row[1]), idx)
-            discovery_labels.append(str(row[0]))
-            discovery_vals.append(float(row[1]))
+        for idx, vals in enumerate(discovery_fmt):
+            insert_striped(discovery_tree, vals, idx)
 
         clear_tree(latest_tree)
-        for idx, row in enumerate(latest_rows):
-            created = row[2]
-            created_txt = created.strftime("%Y-%m-%d") if hasattr(created, "strftime") else str(created)
-            insert_striped(latest_tree, (row[0], row[1], created_txt), idx)
+        for idx, vals in enumerate(latest_rows):
+            insert_striped(latest_tree, vals, idx)
 
-        trend_cache["precision"] = (list(reversed(precision_labels)), list(reversed(precision_vals)))
-        trend_cache["discovery"] = (list(reversed(discovery_labels)), list(reversed(discovery_vals)))
+        trend_cache["precision"] = (precision_labels, precision_vals)
+        trend_cache["discovery"] = (discovery_labels, discovery_vals)
         refresh_charts()
 
     ttk.Button(mon_top, text="Atualizar Estatísticas", command=refresh_monitor).pack(side="right")
 
     def poll_monitor_queue() -> None:
+        monitor_wake_pending.clear()
         try:
             while True:
                 kind, payload = q_monitor.get_nowait()
@@ -3215,10 +4048,24 @@ def run_gui() -> None:
                     monitor_status_var.set(f"Erro: {payload}")
         except queue.Empty:
             pass
-        root.after(200, poll_monitor_queue)
 
-    precision_canvas.bind("<Configure>", lambda _e: refresh_charts())
-    discovery_canvas.bind("<Configure>", lambda _e: refresh_charts())
+    root.bind("<<MonitorMsg>>", lambda _e: poll_monitor_queue())
+    # Um drag de resize emite dezenas de <Configure>; em vez de redesenhar
+    # os dois graficos a cada evento, coalesce tudo num unico redesenho
+    # 50 ms depois do ultimo evento.
+    chart_resize_job: Dict[str, Any] = {"id": None}
+
+    def _chart_resize_done() -> None:
+        chart_resize_job["id"] = None
+        refresh_charts()
+
+    def on_chart_resize(_event: tk.Event) -> None:
+        if chart_resize_job["id"] is not None:
+            root.after_cancel(chart_resize_job["id"])
+        chart_resize_job["id"] = root.after(50, _chart_resize_done)
+
+    precision_canvas.bind("<Configure>", on_chart_resize)
+    discovery_canvas.bind("<Configure>", on_chart_resize)
     poll_monitor_queue()
 
     # Tab Alertas
@@ -3312,16 +4159,36 @@ def run_gui() -> None:
         except ValueError:
             return None
 
-    def load_filter_options() -> None:
+    # Priority e Level quase nunca mudam; o cache por (server, database) com
+    # TTL de 300 s poupa as duas queries a cada clique em Carregar Filtros.
+    filters_cache: Dict[tuple, tuple] = {}
+
+    def load_filter_options(force: bool = False) -> None:
         cfg = cfg_from_fields()
+        key = (cfg.get("server", ""), cfg.get("database", ""))
+        cached = None if force else filters_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < 300.0:
+            priorities, levels = cached[1], cached[2]
+            priority_combo.configure(values=priorities)
+            level_combo.configure(values=levels)
+            if var_priority.get() not in priorities:
+                var_priority.set("Todas")
+            if var_level.get() not in levels:
+                var_level.set("Todos")
+            return
         try:
-            conn = connect(cfg)
+            conn = pooled_connect(cfg)
             cur = conn.cursor()
-            cur.execute("SELECT id_priority, name FROM Priority ORDER BY id_priority;")
+            cur.execute(
+                "SET NOCOUNT ON;"
+                "SELECT id_priority, name FROM Priority ORDER BY id_priority;"
+                "SELECT id_level, description FROM Level ORDER BY id_level;"
+            )
             priorities = ["Todas"] + [f"{pid} - {name}" for pid, name in cur.fetchall()]
-            cur.execute("SELECT id_level, description FROM Level ORDER BY id_level;")
+            cur.nextset()
             levels = ["Todos"] + [f"{lid} - {desc}" for lid, desc in cur.fetchall()]
-            conn.close()
+            release_conn(conn)
+            filters_cache[key] = (time.monotonic(), priorities, levels)
             priority_combo.configure(values=priorities)
             level_combo.configure(values=levels)
             if var_priority.get() not in priorities:
@@ -3331,6 +4198,10 @@ def run_gui() -> None:
         except Exception as ex:
             log_alert(f"[ERRO] Falha ao carregar filtros: {ex}")
 
+    # Por (server, database): True quando a view indexada vAlertDisplay
+    # (Queries/vAlertDisplay.sql) existe; None enquanto nao foi verificado.
+    alert_display_view: Dict[tuple, bool] = {}
+
     def refresh_alerts() -> None:
         cfg = cfg_from_fields()
         priority_id = parse_choice_id(var_priority.get())
@@ -3339,8 +4210,19 @@ def run_gui() -> None:
 
         def worker() -> None:
             try:
-                conn = connect(cfg)
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
+                view_key = (cfg.get("server", ""), cfg.get("database", ""))
+                use_view = alert_display_view.get(view_key)
+                if use_view is None:
+                    cur.execute("SELECT OBJECT_ID('dbo.vAlertDisplay', 'V');")
+                    row = cur.fetchone()
+                    use_view = bool(row and row[0] is not None)
+                    alert_display_view[view_key] = use_view
+                # A view indexada ja tem os joins de apresentacao
+                # materializados; NOEXPAND garante o uso do indice fora da
+                # Enterprise Edition. Sem a migracao, cai na view classica.
+                source = "dbo.vAlertDisplay WITH (NOEXPAND)" if use_view else "vw_Alerts_Detail"
                 where = []
                 params = []
                 if priority_id is not None:
@@ -3362,76 +4244,125 @@ def run_gui() -> None:
                         criteria_trigger,
                         id_priority,
                         id_level
-                    FROM vw_Alerts_Detail
+                    FROM {source}
                     {where_sql}
                     ORDER BY data_generation DESC;
                 """
                 cur.execute(sql, params)
                 rows = cur.fetchall()
-                conn.close()
-                q_alerts.put(("rows", rows))
+                release_conn(conn)
+                # Formatacao de data e tag de nivel resolvidas aqui na thread
+                # de BD; a thread do Tk recebe tuplos prontos a inserir.
+                rows_fmt = []
+                for row in rows:
+                    data_gen = row[1]
+                    data_txt = data_gen.strftime("%Y-%m-%d %H:%M:%S") if hasattr(data_gen, "strftime") else str(data_gen)
+                    level_txt = str(row[3] or "").lower()
+                    level_tag = ""
+                    if "red" in level_txt or "vermelh" in level_txt:
+                        level_tag = "level_red"
+                    elif "orange" in level_txt or "laranj" in level_txt:
+                        level_tag = "level_orange"
+                    elif "yellow" in level_txt or "amarel" in level_txt:
+                        level_tag = "level_yellow"
+                    elif "green" in level_txt or "verd" in level_txt:
+                        level_tag = "level_green"
+                    rows_fmt.append((row[0], data_txt, row[2], row[3], row[4], row[5], level_tag))
+                post_alert(("rows", rows_fmt))
             except Exception as ex:
-                q_alerts.put(("error", [str(ex)]))
-
-        threading.Thread(target=worker, daemon=True).start()
+                post_alert(("error", [str(ex)]))
+
+        submit_db("refresh_alerts", worker)
+
+    # Janela de virtualizacao: a lista completa fica em Python e a arvore so
+    # materializa blocos de 200 itens a medida que o scroll se aproxima do
+    # fundo. Com milhares de alertas o Tcl deixa de guardar (e redesenhar)
+    # filhos que o utilizador nunca chega a ver.
+    alert_rows_state: Dict[str, Any] = {"rows": [], "shown": 0}
+    alert_window = 200
+
+    def append_alert_rows(count: int) -> None:
+        rows = alert_rows_state["rows"]
+        start = alert_rows_state["shown"]
+        end = min(len(rows), start + count)
+        for idx in range(start, end):
+            row = rows[idx]
+            extra_tags = (row[6],) if row[6] else ()
+            insert_striped(alert_tree, row[:6], idx, extra_tags)
+        alert_rows_state["shown"] = end
+
+    def on_alert_scroll(first: str, last: str) -> None:
+        alert_scroll.set(first, last)
+        if float(last) > 0.9 and alert_rows_state["shown"] < len(alert_rows_state["rows"]):
+            append_alert_rows(alert_window)
+
+    alert_tree.configure(yscrollcommand=on_alert_scroll)
 
     def update_alert_tree(rows: list) -> None:
-        for item in alert_tree.get_children():
-            alert_tree.delete(item)
-        for idx, row in enumerate(rows):
-            data_gen = row[1]
-            data_txt = data_gen.strftime("%Y-%m-%d %H:%M:%S") if hasattr(data_gen, "strftime") else str(data_gen)
-            level_txt = str(row[3] or "").lower()
-            level_tag = ""
-            if "red" in level_txt or "vermelh" in level_txt:
-                level_tag = "level_red"
-            elif "orange" in level_txt or "laranj" in level_txt:
-                level_tag = "level_orange"
-            elif "yellow" in level_txt or "amarel" in level_txt:
-                level_tag = "level_yellow"
-            elif "green" in level_txt or "verd" in level_txt:
-                level_tag = "level_green"
-            extra_tags = (level_tag,) if level_tag else ()
-            insert_striped(alert_tree, (row[0], data_txt, row[2], row[3], row[4], row[5]), idx, extra_tags)
+        children = alert_tree.get_children()
+        if children:
+            alert_tree.delete(*children)
+        alert_rows_state["rows"] = rows
+        alert_rows_state["shown"] = 0
+        # Arvore desmapeada durante o enchimento: o Tk nao redesenha nem
+        # recalcula layout a cada insert, so uma vez no re-pack final.
+        alert_tree.pack_forget()
+        try:
+            append_alert_rows(alert_window)
+        finally:
+            alert_tree.pack(fill="both", expand=True, padx=8, pady=8, before=alert_scroll_x)
 
     last_high_id: dict = {"value": None}
-    notify_running: dict = {"value": False}
 
-    def check_high_alerts() -> None:
-        if notify_running["value"]:
-            return
-        notify_running["value"] = True
+    # Consumidor dedicado para as notificacoes: uma unica thread de longa
+    # vida bloqueia no get() da fila de triggers, em vez do flag
+    # notify_running com um worker submetido a cada ciclo de 10 s. O timer
+    # limita-se a por o cfg na fila; triggers acumulados colapsam num so
+    # ciclo. O cfg segue no trigger porque ler as StringVars so e seguro na
+    # thread do Tk.
+    notify_trigger: "queue.Queue[Dict[str, Any]]" = queue.Queue()
 
-        cfg = cfg_from_fields()
+    def check_high_alerts() -> None:
+        notify_trigger.put_nowait(cfg_from_fields())
 
-        def worker() -> None:
+    def notify_loop() -> None:
+        while True:
+            cfg = notify_trigger.get()
             try:
-                conn = connect(cfg)
+                while True:
+                    cfg = notify_trigger.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                conn = pooled_connect(cfg)
                 cur = conn.cursor()
-                cur.execute("SELECT ISNULL(MAX(id_alert), 0) FROM Alert WHERE id_priority = 1;")
-                row = cur.fetchone()
-                max_id = int(row[0] if row else 0)
-                if last_high_id["value"] is None:
-                    last_high_id["value"] = max_id
-                    conn.close()
-                    q_alerts.put(("notify_init", []))
-                    return
+                # MAX e linhas novas num so batch (nextset), como no
+                # load_filter_options: um round-trip por ciclo em vez de
+                # dois. No primeiro ciclo ainda nao ha marca, por isso o
+                # segundo SELECT leva um limiar impossivel e volta vazio.
+                last = last_high_id["value"]
                 cur.execute(
-                    "SELECT id_alert, data_generation, criteria_trigger FROM Alert WHERE id_priority = 1 AND id_alert > ? ORDER BY id_alert;",
-                    last_high_id["value"],
+                    "SELECT ISNULL(MAX(id_alert), 0) FROM Alert WHERE id_priority = 1; "
+                    "SELECT id_alert, data_generation, criteria_trigger FROM Alert "
+                    "WHERE id_priority = 1 AND id_alert > ? ORDER BY id_alert;",
+                    last if last is not None else 2**31 - 1,
                 )
+                row = cur.fetchone()
+                max_id = int(row[0] if row else 0)
+                cur.nextset()
                 new_rows = cur.fetchall()
-                if new_rows:
+                release_conn(conn)
+                if last is None:
                     last_high_id["value"] = max_id
-                conn.close()
+                    post_alert(("notify_init", []))
+                    continue
                 if new_rows:
-                    q_alerts.put(("notify", new_rows))
+                    last_high_id["value"] = max_id
+                    post_alert(("notify", new_rows))
             except Exception as ex:
-                q_alerts.put(("error", [f"Notificações: {ex}"]))
-            finally:
-                notify_running["value"] = False
+                post_alert(("error", [f"Notificações: {ex}"]))
 
-        threading.Thread(target=worker, daemon=True).start()
+    threading.Thread(target=notify_loop, name="neos-notify", daemon=True).start()
 
     def on_toggle_notify() -> None:
         if var_notify_high.get():
@@ -3453,8 +4384,10 @@ def run_gui() -> None:
 
     ttk.Button(filter_frame, text="Atualizar Lista", command=refresh_alerts).grid(row=0, column=4, padx=4, pady=4, sticky="e")
     ttk.Button(filter_frame, text="Carregar Filtros", command=load_filter_options).grid(row=1, column=4, padx=4, pady=4, sticky="e")
+    ttk.Button(filter_frame, text="Recarregar", command=lambda: load_filter_options(force=True)).grid(row=1, column=5, padx=4, pady=4, sticky="e")
     
     def poll_alert_queue() -> None:
+        alert_wake_pending.clear()
         try:
             while True:
                 kind, payload = q_alerts.get_nowait()
@@ -3475,7 +4408,8 @@ def run_gui() -> None:
                     log_alert(payload[0] if payload else "")
         except queue.Empty:
             pass
-        root.after(200, poll_alert_queue)
+
+    root.bind("<<AlertsMsg>>", lambda _e: poll_alert_queue())
 
     def on_close() -> None:
         cfg = cfg_from_fields()
@@ -3486,6 +4420,7 @@ def run_gui() -> None:
     root.protocol("WM_DELETE_WINDOW", on_close)
 
     def poll_gen_queue() -> None:
+        gen_wake_pending.clear()
         try:
             while True:
                 kind, payload = q_gen.get_nowait()
@@ -3503,9 +4438,11 @@ def run_gui() -> None:
                     gen_status_label.configure(style="TagBad.TLabel")
         except queue.Empty:
             pass
-        root.after(200, poll_gen_queue)
+
+    root.bind("<<GenMsg>>", lambda _e: poll_gen_queue())
 
     def poll_script_queue() -> None:
+        script_wake_pending.clear()
         try:
             while True:
                 msg = q_script.get_nowait()
@@ -3522,7 +4459,8 @@ def run_gui() -> None:
                     exec_status_var.set("A executar...")
         except queue.Empty:
             pass
-        root.after(200, poll_script_queue)
+
+    root.bind("<<ScriptMsg>>", lambda _e: poll_script_queue())
 
     poll_queue()
     poll_obs_queue()
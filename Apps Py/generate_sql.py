@@ -1,12 +1,18 @@
 import csv
+import mmap
 import os
+import re
+import sys
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 
 TEMPLATE_SQL = os.path.join("Base de Dados", "NEOs_database_template.sql")
 MERGED_CSV = os.path.join("Ficheiros .csv", "neo_mpcorb_final.csv")
 OUTPUT_SQL = os.path.join("Base de Dados", "NEOs_database_generated.sql")
 OUTPUT_DIR = os.path.join("Base de Dados", "generated_chunks")
 CHUNK_SIZE = 5000
+# Linhas por INSERT multi-row (o SQL Server aceita ate 1000 por VALUES).
+VALUES_PER_INSERT = 900
 
 EXTRA_SQL_SCRIPTS = [
     os.path.join("Queries", "Procedures_UDFs.sql"),
@@ -42,8 +48,14 @@ def normalize_header(fields):
 
 
 def parse_float(x):
-    if x is None:
+    # Caminho rapido: a esmagadora maioria das celulas ou esta vazia ou e um
+    # numero limpo; o strip/NULL fica reservado aos casos raros.
+    if not x:
         return None
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        pass
     x = str(x).strip()
     if x == "" or x.upper() == "NULL":
         return None
@@ -54,8 +66,12 @@ def parse_float(x):
 
 
 def parse_int(x):
-    if x is None:
+    if not x:
         return None
+    try:
+        return int(x)
+    except (TypeError, ValueError):
+        pass
     x = str(x).strip()
     if x == "" or x.upper() == "NULL":
         return None
@@ -66,7 +82,7 @@ def parse_int(x):
 
 
 def parse_date(x):
-    if x is None:
+    if not x:
         return None
     x = str(x).strip()
     if x == "" or x.upper() == "NULL":
@@ -84,31 +100,30 @@ def parse_date(x):
     return None
 
 
+# Tabelas de descodificacao do formato empacotado do MPC, construidas uma
+# vez: seculo pela primeira letra e mes/dia por caracter ('1'-'9', depois
+# 'A' = 10 ate 'V' = 31).
+_MPC_CENTURY = {"I": 1800, "J": 1900, "K": 2000}
+_MPC_MD = {str(v): v for v in range(1, 10)}
+_MPC_MD.update({ch: 10 + i for i, ch in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZ")})
+
+
+@lru_cache(maxsize=None)
 def mpc_packed_to_date(packed):
+    # So existem ~73k datas empacotadas distintas num seculo; com o cache o
+    # caminho quente de cada linha do MPCORB e um lookup de dict.
     packed = (packed or "").strip()
     if len(packed) != 5:
         return None
-    century_map = {"I": 1800, "J": 1900, "K": 2000}
-    c = packed[0]
-    if c not in century_map or not packed[1:3].isdigit():
-        return None
-    year = century_map[c] + int(packed[1:3])
-
-    def decode_md(ch):
-        if ch.isdigit():
-            v = int(ch)
-            return v if 1 <= v <= 9 else None
-        alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        if ch in alphabet:
-            return 10 + alphabet.index(ch)
+    base = _MPC_CENTURY.get(packed[0])
+    if base is None or not packed[1:3].isdigit():
         return None
-
-    month = decode_md(packed[3])
-    day = decode_md(packed[4])
-    if not month or not day:
+    month = _MPC_MD.get(packed[3])
+    day = _MPC_MD.get(packed[4])
+    if month is None or day is None:
         return None
     try:
-        return date(year, month, day)
+        return date(base + int(packed[1:3]), month, day)
     except Exception:
         return None
 
@@ -139,25 +154,34 @@ def norm_text(x):
     return v
 
 
+# Estes formatadores correm ~35 vezes por linha de orbita; os fast paths
+# evitam conversoes redundantes (str sobre str, float sobre float) no caso
+# que domina de longe.
 def sql_text(value, allow_null=True, empty_as_null=True):
     if value is None:
         return "NULL" if allow_null else "N''"
-    v = str(value).strip()
+    v = value if type(value) is str else str(value)
+    v = v.strip()
     if v == "" or v.upper() == "NULL":
         if allow_null and empty_as_null:
             return "NULL"
         return "N''"
-    v = v.replace("'", "''")
-    return f"N'{v}'"
+    if "'" in v:
+        v = v.replace("'", "''")
+    return "N'" + v + "'"
 
 
 def sql_float(value):
+    if type(value) is float:
+        return repr(value)
     if value is None:
         return "NULL"
     return repr(float(value))
 
 
 def sql_int(value):
+    if type(value) is int:
+        return str(value)
     if value is None:
         return "NULL"
     return str(int(value))
@@ -197,7 +221,111 @@ def split_designation_full(value):
     return "", v
 
 
+# Cache de um elemento para o parse do CSV: gerar SQL duas vezes seguidas
+# (ou a seguir a um load) sobre o mesmo ficheiro nao repete o parse. O mtime
+# e o tamanho na chave invalidam quando o ficheiro muda.
+_parse_cache = {"key": None, "data": None}
+
+
 def build_data_from_csv(path):
+    try:
+        key = (os.path.abspath(path), os.path.getmtime(path), os.path.getsize(path))
+    except OSError:
+        key = None
+    if key is not None and _parse_cache["key"] == key:
+        return _parse_cache["data"]
+    data = _build_data_from_csv(path)
+    if key is not None:
+        _parse_cache["key"] = key
+        _parse_cache["data"] = data
+    return data
+
+
+# Registos do merge com __slots__: sem o __dict__ por objeto, cada registo
+# ocupa uma fracao do dict equivalente e o acesso aos campos e um descritor
+# em C. Em CSVs grandes (milhoes de linhas) a diferenca de memoria e de
+# centenas de MB.
+class AsteroidRec:
+    __slots__ = (
+        "id_internal", "spkid", "full_name", "pdes", "name", "prefix",
+        "neo_flag", "pha_flag", "diameter", "absolute_magnitude",
+        "albedo", "diameter_sigma", "neo_id",
+    )
+
+    def __init__(self, id_internal, spkid, full_name, pdes, name, prefix,
+                 neo_flag, pha_flag, diameter, absolute_magnitude,
+                 albedo, diameter_sigma, neo_id):
+        self.id_internal = id_internal
+        self.spkid = spkid
+        self.full_name = full_name
+        self.pdes = pdes
+        self.name = name
+        self.prefix = prefix
+        self.neo_flag = neo_flag
+        self.pha_flag = pha_flag
+        self.diameter = diameter
+        self.absolute_magnitude = absolute_magnitude
+        self.albedo = albedo
+        self.diameter_sigma = diameter_sigma
+        self.neo_id = neo_id
+
+
+class OrbitRec:
+    # "class" e palavra reservada; o campo chama-se cls.
+    __slots__ = (
+        "id_orbita", "epoch", "rms", "moid_ld", "epoch_mjd", "epoch_cal",
+        "tp", "tp_cal", "per", "per_y", "equinox", "orbit_uncertainty",
+        "condition_code", "e", "a", "q", "i", "om", "w", "ma", "ad", "n",
+        "moid", "sigma_e", "sigma_a", "sigma_q", "sigma_i", "sigma_n",
+        "sigma_ma", "sigma_om", "sigma_w", "sigma_ad", "sigma_tp",
+        "sigma_per", "id_internal", "cls",
+    )
+
+    def __init__(self, id_orbita, epoch, rms, moid_ld, epoch_mjd, epoch_cal,
+                 tp, tp_cal, per, per_y, equinox, orbit_uncertainty,
+                 condition_code, e, a, q, i, om, w, ma, ad, n, moid,
+                 sigma_e, sigma_a, sigma_q, sigma_i, sigma_n, sigma_ma,
+                 sigma_om, sigma_w, sigma_ad, sigma_tp, sigma_per,
+                 id_internal, cls):
+        self.id_orbita = id_orbita
+        self.epoch = epoch
+        self.rms = rms
+        self.moid_ld = moid_ld
+        self.epoch_mjd = epoch_mjd
+        self.epoch_cal = epoch_cal
+        self.tp = tp
+        self.tp_cal = tp_cal
+        self.per = per
+        self.per_y = per_y
+        self.equinox = equinox
+        self.orbit_uncertainty = orbit_uncertainty
+        self.condition_code = condition_code
+        self.e = e
+        self.a = a
+        self.q = q
+        self.i = i
+        self.om = om
+        self.w = w
+        self.ma = ma
+        self.ad = ad
+        self.n = n
+        self.moid = moid
+        self.sigma_e = sigma_e
+        self.sigma_a = sigma_a
+        self.sigma_q = sigma_q
+        self.sigma_i = sigma_i
+        self.sigma_n = sigma_n
+        self.sigma_ma = sigma_ma
+        self.sigma_om = sigma_om
+        self.sigma_w = sigma_w
+        self.sigma_ad = sigma_ad
+        self.sigma_tp = sigma_tp
+        self.sigma_per = sigma_per
+        self.id_internal = id_internal
+        self.cls = cls
+
+
+def _build_data_from_csv(path):
     with open(path, "r", encoding="utf-8", errors="ignore", newline="") as f:
         first_line = ""
         for line in f:
@@ -245,6 +373,11 @@ def build_data_from_csv(path):
             if not cls and orbit_type:
                 cls = orbit_type[:20]
             cls_desc = (row.get("class_description") or orbit_type or cls).strip()
+            # Valores curtos que se repetem em quase todas as linhas (codigo
+            # de classe, descricao): internados, todas as ocorrencias
+            # partilham o mesmo objeto em vez de N copias da mesma string.
+            cls = sys.intern(cls)
+            cls_desc = sys.intern(cls_desc)
             if cls:
                 class_map.setdefault(cls, cls_desc or cls)
 
@@ -265,7 +398,7 @@ def build_data_from_csv(path):
             prefix = norm_text(row.get("prefix"))
             if prefix:
                 prefix = prefix[:10]
-            prefix = ensure_prefix(prefix)
+            prefix = sys.intern(ensure_prefix(prefix))
             neo_flag = norm_flag(row.get("neo"))
             pha_flag = norm_flag(row.get("pha"))
             h = parse_float(row.get("h") or "")
@@ -280,34 +413,34 @@ def build_data_from_csv(path):
             if id_internal is not None:
                 ast = asteroids.get(id_internal)
                 if ast is None:
-                    asteroids[id_internal] = {
-                        "id_internal": id_internal,
-                        "spkid": spkid,
-                        "full_name": full_name,
-                        "pdes": pdes,
-                        "name": name,
-                        "prefix": prefix,
-                        "neo_flag": neo_flag,
-                        "pha_flag": pha_flag,
-                        "diameter": diameter,
-                        "absolute_magnitude": h,
-                        "albedo": albedo,
-                        "diameter_sigma": diameter_sigma,
-                        "neo_id": neo_id,
-                    }
+                    asteroids[id_internal] = AsteroidRec(
+                        id_internal=id_internal,
+                        spkid=spkid,
+                        full_name=full_name,
+                        pdes=pdes,
+                        name=name,
+                        prefix=prefix,
+                        neo_flag=neo_flag,
+                        pha_flag=pha_flag,
+                        diameter=diameter,
+                        absolute_magnitude=h,
+                        albedo=albedo,
+                        diameter_sigma=diameter_sigma,
+                        neo_id=neo_id,
+                    )
                 else:
-                    ast["spkid"] = merge_numeric(ast["spkid"], spkid)
-                    ast["full_name"] = merge_field(ast["full_name"], full_name)
-                    ast["pdes"] = merge_field(ast["pdes"], pdes)
-                    ast["name"] = merge_field(ast["name"], name)
-                    ast["prefix"] = merge_field(ast["prefix"], prefix)
-                    ast["neo_flag"] = merge_field(ast["neo_flag"], neo_flag)
-                    ast["pha_flag"] = merge_field(ast["pha_flag"], pha_flag)
-                    ast["diameter"] = merge_numeric(ast["diameter"], diameter)
-                    ast["absolute_magnitude"] = merge_numeric(ast["absolute_magnitude"], h)
-                    ast["albedo"] = merge_numeric(ast["albedo"], albedo)
-                    ast["diameter_sigma"] = merge_numeric(ast["diameter_sigma"], diameter_sigma)
-                    ast["neo_id"] = merge_field(ast["neo_id"], neo_id)
+                    ast.spkid = merge_numeric(ast.spkid, spkid)
+                    ast.full_name = merge_field(ast.full_name, full_name)
+                    ast.pdes = merge_field(ast.pdes, pdes)
+                    ast.name = merge_field(ast.name, name)
+                    ast.prefix = merge_field(ast.prefix, prefix)
+                    ast.neo_flag = merge_field(ast.neo_flag, neo_flag)
+                    ast.pha_flag = merge_field(ast.pha_flag, pha_flag)
+                    ast.diameter = merge_numeric(ast.diameter, diameter)
+                    ast.absolute_magnitude = merge_numeric(ast.absolute_magnitude, h)
+                    ast.albedo = merge_numeric(ast.albedo, albedo)
+                    ast.diameter_sigma = merge_numeric(ast.diameter_sigma, diameter_sigma)
+                    ast.neo_id = merge_field(ast.neo_id, neo_id)
 
             orbit_id = norm_text(row.get("orbit_id"))
             if not orbit_id:
@@ -329,7 +462,7 @@ def build_data_from_csv(path):
                     epoch_mjd = date_to_mjd(epoch_cal)
                     epoch = epoch_mjd + 2400000.5
 
-            equinox = (row.get("equinox") or "J2000").strip() or "J2000"
+            equinox = sys.intern((row.get("equinox") or "J2000").strip() or "J2000")
             rms = parse_float(row.get("rms") or "")
             if rms is None:
                 rms = parse_float(row.get("rms_residual") or "")
@@ -396,87 +529,95 @@ def build_data_from_csv(path):
 
             orb = orbits.get(orbit_id)
             if orb is None:
-                orbits[orbit_id] = {
-                    "id_orbita": orbit_id,
-                    "epoch": epoch if epoch is not None else (epoch_mjd if epoch_mjd is not None else 0.0),
-                    "rms": rms or 0.0,
-                    "moid_ld": moid_ld or 0.0,
-                    "epoch_mjd": epoch_mjd,
-                    "epoch_cal": epoch_cal,
-                    "tp": tp or 0.0,
-                    "tp_cal": tp_cal,
-                    "per": per or 0.0,
-                    "per_y": per_y or 0.0,
-                    "equinox": equinox,
-                    "orbit_uncertainty": orbit_uncertainty,
-                    "condition_code": None,
-                    "e": e or 0.0,
-                    "a": a or 0.0,
-                    "q": q or 0.0,
-                    "i": inc or 0.0,
-                    "om": om or 0.0,
-                    "w": w or 0.0,
-                    "ma": ma or 0.0,
-                    "ad": ad or 0.0,
-                    "n": n or 0.0,
-                    "moid": moid or 0.0,
-                    "sigma_e": sigma_e,
-                    "sigma_a": sigma_a,
-                    "sigma_q": sigma_q,
-                    "sigma_i": sigma_i,
-                    "sigma_n": sigma_n,
-                    "sigma_ma": sigma_ma,
-                    "sigma_om": sigma_om,
-                    "sigma_w": sigma_w,
-                    "sigma_ad": sigma_ad,
-                    "sigma_tp": sigma_tp,
-                    "sigma_per": sigma_per,
-                    "id_internal": id_internal,
-                    "class": cls or "NEA",
-                }
+                orbits[orbit_id] = OrbitRec(
+                    id_orbita=orbit_id,
+                    epoch=epoch if epoch is not None else (epoch_mjd if epoch_mjd is not None else 0.0),
+                    rms=rms or 0.0,
+                    moid_ld=moid_ld or 0.0,
+                    epoch_mjd=epoch_mjd,
+                    epoch_cal=epoch_cal,
+                    tp=tp or 0.0,
+                    tp_cal=tp_cal,
+                    per=per or 0.0,
+                    per_y=per_y or 0.0,
+                    equinox=equinox,
+                    orbit_uncertainty=orbit_uncertainty,
+                    condition_code=None,
+                    e=e or 0.0,
+                    a=a or 0.0,
+                    q=q or 0.0,
+                    i=inc or 0.0,
+                    om=om or 0.0,
+                    w=w or 0.0,
+                    ma=ma or 0.0,
+                    ad=ad or 0.0,
+                    n=n or 0.0,
+                    moid=moid or 0.0,
+                    sigma_e=sigma_e,
+                    sigma_a=sigma_a,
+                    sigma_q=sigma_q,
+                    sigma_i=sigma_i,
+                    sigma_n=sigma_n,
+                    sigma_ma=sigma_ma,
+                    sigma_om=sigma_om,
+                    sigma_w=sigma_w,
+                    sigma_ad=sigma_ad,
+                    sigma_tp=sigma_tp,
+                    sigma_per=sigma_per,
+                    id_internal=id_internal,
+                    cls=cls or "NEA",
+                )
             else:
-                if orb["id_internal"] is None and id_internal is not None:
-                    orb["id_internal"] = id_internal
-                elif id_internal is not None and orb["id_internal"] is not None:
-                    if int(orb["id_internal"]) != int(id_internal):
+                if orb.id_internal is None and id_internal is not None:
+                    orb.id_internal = id_internal
+                elif id_internal is not None and orb.id_internal is not None:
+                    if int(orb.id_internal) != int(id_internal):
                         continue
-                orb["epoch"] = merge_numeric(orb["epoch"], epoch)
-                orb["rms"] = merge_numeric(orb["rms"], rms)
-                orb["moid_ld"] = merge_numeric(orb["moid_ld"], moid_ld)
-                orb["epoch_mjd"] = merge_numeric(orb["epoch_mjd"], epoch_mjd)
-                orb["epoch_cal"] = merge_field(orb["epoch_cal"], epoch_cal)
-                orb["tp"] = merge_numeric(orb["tp"], tp)
-                orb["tp_cal"] = merge_field(orb["tp_cal"], tp_cal)
-                orb["per"] = merge_numeric(orb["per"], per)
-                orb["per_y"] = merge_numeric(orb["per_y"], per_y)
-                orb["equinox"] = merge_field(orb["equinox"], equinox)
-                orb["orbit_uncertainty"] = merge_numeric(orb["orbit_uncertainty"], orbit_uncertainty)
-                orb["e"] = merge_numeric(orb["e"], e)
-                orb["a"] = merge_numeric(orb["a"], a)
-                orb["q"] = merge_numeric(orb["q"], q)
-                orb["i"] = merge_numeric(orb["i"], inc)
-                orb["om"] = merge_numeric(orb["om"], om)
-                orb["w"] = merge_numeric(orb["w"], w)
-                orb["ma"] = merge_numeric(orb["ma"], ma)
-                orb["ad"] = merge_numeric(orb["ad"], ad)
-                orb["n"] = merge_numeric(orb["n"], n)
-                orb["moid"] = merge_numeric(orb["moid"], moid)
-                orb["sigma_e"] = merge_numeric(orb["sigma_e"], sigma_e)
-                orb["sigma_a"] = merge_numeric(orb["sigma_a"], sigma_a)
-                orb["sigma_q"] = merge_numeric(orb["sigma_q"], sigma_q)
-                orb["sigma_i"] = merge_numeric(orb["sigma_i"], sigma_i)
-                orb["sigma_n"] = merge_numeric(orb["sigma_n"], sigma_n)
-                orb["sigma_ma"] = merge_numeric(orb["sigma_ma"], sigma_ma)
-                orb["sigma_om"] = merge_numeric(orb["sigma_om"], sigma_om)
-                orb["sigma_w"] = merge_numeric(orb["sigma_w"], sigma_w)
-                orb["sigma_ad"] = merge_numeric(orb["sigma_ad"], sigma_ad)
-                orb["sigma_tp"] = merge_numeric(orb["sigma_tp"], sigma_tp)
-                orb["sigma_per"] = merge_numeric(orb["sigma_per"], sigma_per)
-                orb["class"] = merge_field(orb["class"], cls)
+                orb.epoch = merge_numeric(orb.epoch, epoch)
+                orb.rms = merge_numeric(orb.rms, rms)
+                orb.moid_ld = merge_numeric(orb.moid_ld, moid_ld)
+                orb.epoch_mjd = merge_numeric(orb.epoch_mjd, epoch_mjd)
+                orb.epoch_cal = merge_field(orb.epoch_cal, epoch_cal)
+                orb.tp = merge_numeric(orb.tp, tp)
+                orb.tp_cal = merge_field(orb.tp_cal, tp_cal)
+                orb.per = merge_numeric(orb.per, per)
+                orb.per_y = merge_numeric(orb.per_y, per_y)
+                orb.equinox = merge_field(orb.equinox, equinox)
+                orb.orbit_uncertainty = merge_numeric(orb.orbit_uncertainty, orbit_uncertainty)
+                orb.e = merge_numeric(orb.e, e)
+                orb.a = merge_numeric(orb.a, a)
+                orb.q = merge_numeric(orb.q, q)
+                orb.i = merge_numeric(orb.i, inc)
+                orb.om = merge_numeric(orb.om, om)
+                orb.w = merge_numeric(orb.w, w)
+                orb.ma = merge_numeric(orb.ma, ma)
+                orb.ad = merge_numeric(orb.ad, ad)
+                orb.n = merge_numeric(orb.n, n)
+                orb.moid = merge_numeric(orb.moid, moid)
+                orb.sigma_e = merge_numeric(orb.sigma_e, sigma_e)
+                orb.sigma_a = merge_numeric(orb.sigma_a, sigma_a)
+                orb.sigma_q = merge_numeric(orb.sigma_q, sigma_q)
+                orb.sigma_i = merge_numeric(orb.sigma_i, sigma_i)
+                orb.sigma_n = merge_numeric(orb.sigma_n, sigma_n)
+                orb.sigma_ma = merge_numeric(orb.sigma_ma, sigma_ma)
+                orb.sigma_om = merge_numeric(orb.sigma_om, sigma_om)
+                orb.sigma_w = merge_numeric(orb.sigma_w, sigma_w)
+                orb.sigma_ad = merge_numeric(orb.sigma_ad, sigma_ad)
+                orb.sigma_tp = merge_numeric(orb.sigma_tp, sigma_tp)
+                orb.sigma_per = merge_numeric(orb.sigma_per, sigma_per)
+                orb.cls = merge_field(orb.cls, cls)
 
         return class_map, asteroids, orbits
 
 
+def _multi_row_inserts(insert_prefix, row_values, per_insert=VALUES_PER_INSERT):
+    stmts = []
+    for i in range(0, len(row_values), per_insert):
+        chunk = row_values[i : i + per_insert]
+        stmts.append(insert_prefix + " VALUES\n    " + ",\n    ".join(chunk) + ";")
+    return stmts
+
+
 def build_insert_blocks(class_map, asteroids, orbits):
     class_lines = []
     for cls in sorted(class_map.keys()):
@@ -486,66 +627,95 @@ def build_insert_blocks(class_map, asteroids, orbits):
             f"{sql_text(desc)}, {sql_text(cls, allow_null=False, empty_as_null=False)});"
         )
 
-    asteroid_lines = []
-    for id_internal in sorted(asteroids.keys()):
-        a = asteroids[id_internal]
-        asteroid_lines.append(
-            "INSERT [dbo].[Asteroid] "
-            "([id_internal], [spkid], [full_name], [pdes], [name], [prefix], [neo_flag], "
-            "[pha_flag], [diameter], [absolute_magnitude], [albedo], [diameter_sigma], "
-            "[created_at], [neo_id]) VALUES ("
-            f"{sql_int(a['id_internal'])}, {sql_int(a['spkid'])}, "
-            f"{sql_text(a['full_name'], allow_null=False, empty_as_null=False)}, "
-            f"{sql_text(a['pdes'], allow_null=False, empty_as_null=False)}, "
-            f"{sql_text(a['name'])}, "
-            f"{sql_text(a['prefix'], allow_null=False, empty_as_null=False)}, "
-            f"{sql_text(a['neo_flag'], allow_null=False, empty_as_null=False)}, "
-            f"{sql_text(a['pha_flag'], allow_null=False, empty_as_null=False)}, "
-            f"{sql_float(a['diameter'])}, {sql_float(a['absolute_magnitude'])}, "
-            f"{sql_float(a['albedo'])}, {sql_float(a['diameter_sigma'])}, "
+    # Asteroides e orbitas saem em INSERTs multi-row de VALUES_PER_INSERT
+    # linhas: o servidor faz parse de um statement em vez de centenas, e o
+    # overhead por linha cai para uma virgula.
+    # Iteracao em ordem de insercao: os asteroides ja entram por id_internal
+    # crescente (ids alocados sequencialmente) e a ordem das orbitas e
+    # irrelevante para INSERTs. Poupa o sort O(N log N) e a lista de chaves.
+    asteroid_values = []
+    for a in asteroids.values():
+        asteroid_values.append(
+            "("
+            f"{sql_int(a.id_internal)}, {sql_int(a.spkid)}, "
+            f"{sql_text(a.full_name, allow_null=False, empty_as_null=False)}, "
+            f"{sql_text(a.pdes, allow_null=False, empty_as_null=False)}, "
+            f"{sql_text(a.name)}, "
+            f"{sql_text(a.prefix, allow_null=False, empty_as_null=False)}, "
+            f"{sql_text(a.neo_flag, allow_null=False, empty_as_null=False)}, "
+            f"{sql_text(a.pha_flag, allow_null=False, empty_as_null=False)}, "
+            f"{sql_float(a.diameter)}, {sql_float(a.absolute_magnitude)}, "
+            f"{sql_float(a.albedo)}, {sql_float(a.diameter_sigma)}, "
             "SYSDATETIME(), "
-            f"{sql_text(a['neo_id'])}"
-            ");"
+            f"{sql_text(a.neo_id)}"
+            ")"
         )
-
-    orbit_lines = []
-    for orbit_id in sorted(orbits.keys()):
-        o = orbits[orbit_id]
-        orbit_lines.append(
-            "INSERT [dbo].[Orbit] "
-            "([id_orbita], [epoch], [rms], [moid_ld], [epoch_mjd], [epoch_cal], [tp], [tp_cal], "
-            "[per], [per_y], [equinox], [orbit_uncertainty], [condition_code], [e], [a], [q], "
-            "[i], [om], [w], [ma], [ad], [n], [moid], [sigma_e], [sigma_a], [sigma_q], [sigma_i], "
-            "[sigma_n], [sigma_ma], [sigma_om], [sigma_w], [sigma_ad], [sigma_tp], [sigma_per], "
-            "[id_internal], [class]) VALUES ("
-            f"{sql_text(o['id_orbita'], allow_null=False, empty_as_null=False)}, {sql_float(o['epoch'])}, {sql_float(o['rms'])}, "
-            f"{sql_float(o['moid_ld'])}, {sql_float(o['epoch_mjd'])}, {sql_date(o['epoch_cal'])}, "
-            f"{sql_float(o['tp'])}, {sql_date(o['tp_cal'])}, {sql_float(o['per'])}, "
-            f"{sql_float(o['per_y'])}, {sql_text(o['equinox'], allow_null=False, empty_as_null=False)}, {sql_int(o['orbit_uncertainty'])}, "
-            f"{sql_int(o['condition_code'])}, {sql_float(o['e'])}, {sql_float(o['a'])}, "
-            f"{sql_float(o['q'])}, {sql_float(o['i'])}, {sql_float(o['om'])}, {sql_float(o['w'])}, "
-            f"{sql_float(o['ma'])}, {sql_float(o['ad'])}, {sql_float(o['n'])}, {sql_float(o['moid'])}, "
-            f"{sql_float(o['sigma_e'])}, {sql_float(o['sigma_a'])}, {sql_float(o['sigma_q'])}, "
-            f"{sql_float(o['sigma_i'])}, {sql_float(o['sigma_n'])}, {sql_float(o['sigma_ma'])}, "
-            f"{sql_float(o['sigma_om'])}, {sql_float(o['sigma_w'])}, {sql_float(o['sigma_ad'])}, "
-            f"{sql_float(o['sigma_tp'])}, {sql_float(o['sigma_per'])}, {sql_int(o['id_internal'])}, "
-            f"{sql_text(o['class'], allow_null=False, empty_as_null=False)}"
-            ");"
+    asteroid_lines = _multi_row_inserts(
+        "INSERT [dbo].[Asteroid] "
+        "([id_internal], [spkid], [full_name], [pdes], [name], [prefix], [neo_flag], "
+        "[pha_flag], [diameter], [absolute_magnitude], [albedo], [diameter_sigma], "
+        "[created_at], [neo_id])",
+        asteroid_values,
+    )
+
+    orbit_values = []
+    for o in orbits.values():
+        orbit_values.append(
+            "("
+            f"{sql_text(o.id_orbita, allow_null=False, empty_as_null=False)}, {sql_float(o.epoch)}, {sql_float(o.rms)}, "
+            f"{sql_float(o.moid_ld)}, {sql_float(o.epoch_mjd)}, {sql_date(o.epoch_cal)}, "
+            f"{sql_float(o.tp)}, {sql_date(o.tp_cal)}, {sql_float(o.per)}, "
+            f"{sql_float(o.per_y)}, {sql_text(o.equinox, allow_null=False, empty_as_null=False)}, {sql_int(o.orbit_uncertainty)}, "
+            f"{sql_int(o.condition_code)}, {sql_float(o.e)}, {sql_float(o.a)}, "
+            f"{sql_float(o.q)}, {sql_float(o.i)}, {sql_float(o.om)}, {sql_float(o.w)}, "
+            f"{sql_float(o.ma)}, {sql_float(o.ad)}, {sql_float(o.n)}, {sql_float(o.moid)}, "
+            f"{sql_float(o.sigma_e)}, {sql_float(o.sigma_a)}, {sql_float(o.sigma_q)}, "
+            f"{sql_float(o.sigma_i)}, {sql_float(o.sigma_n)}, {sql_float(o.sigma_ma)}, "
+            f"{sql_float(o.sigma_om)}, {sql_float(o.sigma_w)}, {sql_float(o.sigma_ad)}, "
+            f"{sql_float(o.sigma_tp)}, {sql_float(o.sigma_per)}, {sql_int(o.id_internal)}, "
+            f"{sql_text(o.cls, allow_null=False, empty_as_null=False)}"
+            ")"
         )
+    orbit_lines = _multi_row_inserts(
+        "INSERT [dbo].[Orbit] "
+        "([id_orbita], [epoch], [rms], [moid_ld], [epoch_mjd], [epoch_cal], [tp], [tp_cal], "
+        "[per], [per_y], [equinox], [orbit_uncertainty], [condition_code], [e], [a], [q], "
+        "[i], [om], [w], [ma], [ad], [n], [moid], [sigma_e], [sigma_a], [sigma_q], [sigma_i], "
+        "[sigma_n], [sigma_ma], [sigma_om], [sigma_w], [sigma_ad], [sigma_tp], [sigma_per], "
+        "[id_internal], [class])",
+        orbit_values,
+    )
 
     return class_lines, asteroid_lines, orbit_lines
 
 
-def read_text_with_bom(path):
+def read_lines_with_bom(path):
+    # Itera as linhas a partir de um mmap, decodificando uma de cada vez:
+    # evita materializar o ficheiro inteiro como str e ainda a lista do
+    # splitlines (pico de memoria ~2x o tamanho do template). UTF-16 nao se
+    # parte com seguranca em b"\n", por isso mantem o caminho antigo.
     with open(path, "rb") as f:
-        data = f.read()
-    if data.startswith(b"\xff\xfe"):
-        return data.decode("utf-16-le", errors="ignore")
-    if data.startswith(b"\xfe\xff"):
-        return data.decode("utf-16-be", errors="ignore")
-    if data.startswith(b"\xef\xbb\xbf"):
-        return data.decode("utf-8-sig", errors="ignore")
-    return data.decode("utf-8", errors="ignore")
+        head = f.read(2)
+        if head in (b"\xff\xfe", b"\xfe\xff"):
+            f.seek(0)
+            enc = "utf-16-le" if head == b"\xff\xfe" else "utf-16-be"
+            yield from f.read().decode(enc, errors="ignore").splitlines()
+            return
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # ficheiro vazio
+        try:
+            mm.seek(3 if mm[:3] == b"\xef\xbb\xbf" else 0)
+            for raw in iter(mm.readline, b""):
+                line = raw.decode("utf-8", errors="ignore")
+                if line.endswith("\n"):
+                    line = line[:-1]
+                if line.endswith("\r"):
+                    line = line[:-1]
+                yield line
+        finally:
+            mm.close()
 
 
 def _append_extra_scripts(out_lines):
@@ -556,7 +726,7 @@ def _append_extra_scripts(out_lines):
             continue
         out_lines.append("")
         out_lines.append(f"-- BEGIN EXTRA: {rel_path}")
-        for ln in read_text_with_bom(script_path).splitlines():
+        for ln in read_lines_with_bom(script_path):
             out_lines.append(ln.rstrip("\ufeff"))
         out_lines.append(f"-- END EXTRA: {rel_path}")
         out_lines.append("")
@@ -571,32 +741,39 @@ def _extract_use_header(lines):
 
 
 def _write_lines(path, lines):
-    with open(path, "w", encoding="utf-8", newline="\n") as f:
-        for ln in lines:
-            f.write(ln + "\n")
+    # Join unico, encode unico e uma escrita binaria ao SO: sem a camada
+    # TextIOWrapper (o formato final ja e "\n" + UTF-8) nem flushes
+    # intermedios, o ficheiro sai em um punhado de writes grandes.
+    data = ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+    with open(path, "wb") as f:
+        f.write(data)
 
 
-def write_sql_chunks(template_path, output_dir, class_lines, asteroid_lines, orbit_lines):
-    lines = read_text_with_bom(template_path).splitlines()
+# Classificador das linhas INSERT do template num unico match de regex
+# compilada: dispensa o lstrip + lower() (duas alocacoes por linha do
+# template) e os tres startswith encadeados.
+_INSERT_RE = re.compile(
+    r"^[\s\ufeff]*insert \[dbo\]\.\[(asteroid|orbit|class_orbital)\]",
+    re.IGNORECASE,
+)
 
-    def strip_prefix(line):
-        return line.lstrip().lstrip("\ufeff")
+_INSERT_KIND = {"asteroid": "asteroid", "orbit": "orbit", "class_orbital": "class"}
 
+
+def write_sql_chunks(template_path, output_dir, class_lines, asteroid_lines, orbit_lines):
     def insert_type(line):
-        s = strip_prefix(line).lower()
-        if s.startswith("insert [dbo].[asteroid]"):
-            return "asteroid"
-        if s.startswith("insert [dbo].[orbit]"):
-            return "orbit"
-        if s.startswith("insert [dbo].[class_orbital]"):
-            return "class"
-        return None
+        m = _INSERT_RE.match(line)
+        if m is None:
+            return None
+        return _INSERT_KIND[m.group(1).lower()]
 
+    # O template flui diretamente do gerador do mmap para out_lines: so a
+    # versao filtrada fica em memoria, nunca a lista de linhas original.
     found = {"asteroid": False, "orbit": False, "class": False}
     out_lines = []
     in_asteroid = False
     in_orbit = False
-    for line in lines:
+    for line in read_lines_with_bom(template_path):
         if line.strip().startswith("CREATE TABLE [dbo].[Asteroid]"):
             in_asteroid = True
         if line.strip().startswith("CREATE TABLE [dbo].[Orbit]"):
@@ -638,10 +815,14 @@ def write_sql_chunks(template_path, output_dir, class_lines, asteroid_lines, orb
     class_path = os.path.join(output_dir, "01_class_orbital.sql")
     _write_lines(class_path, header + class_lines)
 
+    # Cada elemento e agora um INSERT multi-row de ate VALUES_PER_INSERT
+    # linhas; os ficheiros continuam a rondar CHUNK_SIZE linhas de dados.
+    stmts_per_file = max(1, CHUNK_SIZE // VALUES_PER_INSERT)
+
     def write_chunks(lines_src, prefix):
-        for i in range(0, len(lines_src), CHUNK_SIZE):
-            chunk = lines_src[i : i + CHUNK_SIZE]
-            idx = (i // CHUNK_SIZE) + 1
+        for i in range(0, len(lines_src), stmts_per_file):
+            chunk = lines_src[i : i + stmts_per_file]
+            idx = (i // stmts_per_file) + 1
             name = f"{prefix}_{idx:04d}.sql"
             path = os.path.join(output_dir, name)
             _write_lines(path, header + chunk)
@@ -0,0 +1,27 @@
+-- Sequences para geracao de ids sem scan de MAX() na tabela.
+-- O loader (app_sql_client.py) usa sp_sequence_get_range para reservar blocos;
+-- se as sequences nao existirem, cai no fallback antigo (ISNULL(MAX(...),0)+1).
+
+IF NOT EXISTS (SELECT 1 FROM sys.sequences WHERE name = 'SeqAsteroidId')
+BEGIN
+    DECLARE @start_ast bigint = (SELECT ISNULL(MAX(id_internal), 0) + 1 FROM Asteroid);
+    DECLARE @sql_ast nvarchar(400) =
+        N'CREATE SEQUENCE dbo.SeqAsteroidId AS bigint START WITH '
+        + CAST(@start_ast AS nvarchar(20)) + N' INCREMENT BY 1 CACHE 1000;';
+    EXEC sp_executesql @sql_ast;
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.sequences WHERE name = 'SeqMpcOrbit')
+BEGIN
+    DECLARE @start_mpc bigint = (
+        SELECT ISNULL(MAX(TRY_CONVERT(bigint, SUBSTRING(id_orbita, 4, 50))), 0) + 1
+        FROM Orbit
+        WHERE id_orbita LIKE 'MPC%'
+    );
+    DECLARE @sql_mpc nvarchar(400) =
+        N'CREATE SEQUENCE dbo.SeqMpcOrbit AS bigint START WITH '
+        + CAST(@start_mpc AS nvarchar(20)) + N' INCREMENT BY 1 CACHE 1000;';
+    EXEC sp_executesql @sql_mpc;
+END
+GO
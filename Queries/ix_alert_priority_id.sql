@@ -0,0 +1,17 @@
+-- Indice filtrado que cobre o poll de alertas de prioridade alta.
+-- O notify_loop (app_sql_client.py) corre a cada verificacao
+--   SELECT ISNULL(MAX(id_alert), 0) FROM Alert WHERE id_priority = 1
+-- e depois le id_alert/data_generation/criteria_trigger das linhas novas;
+-- sem indice isto e um scan da Alert. Com o indice filtrado o MAX passa a
+-- lookup no topo da B-tree e o SELECT das novas e um seek coberto, sem
+-- key lookups.
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'ix_alert_priority_id' AND object_id = OBJECT_ID('dbo.Alert')
+)
+    CREATE INDEX ix_alert_priority_id
+        ON dbo.Alert (id_priority, id_alert DESC)
+        INCLUDE (data_generation, criteria_trigger)
+        WHERE id_priority = 1;
+GO
@@ -0,0 +1,194 @@
+-- Procedimento que executa a simulacao de alertas inteira no servidor.
+-- O simulate_alerts (app_alert_creator.py) fazia ate 8 round-trips
+-- (SELECT TOP 1 + UPDATE/INSERT por cenario); com o proc instalado passa
+-- a ser um unico EXEC com plano em cache. Sem esta migracao a app
+-- continua a usar o caminho antigo statement a statement.
+--
+-- Devolve dois result sets: as linhas de log e o total de alertas criados.
+
+IF OBJECT_ID('dbo.sp_SimulateAlerts', 'P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_SimulateAlerts;
+GO
+
+CREATE PROCEDURE dbo.sp_SimulateAlerts
+    @close_7d bit = 0,
+    @pha_uncertain bit = 0,
+    @new_large bit = 0,
+    @significant_change bit = 0,
+    @cluster_month bit = 0,
+    @anomaly bit = 0
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @created int = 0;
+    DECLARE @logs TABLE (msg nvarchar(200));
+    DECLARE @base_id int;
+    DECLARE @id int;
+
+    IF @close_7d = 1 OR @cluster_month = 1
+    BEGIN
+        SELECT TOP 1 @base_id = id_internal
+        FROM Asteroid
+        WHERE diameter IS NOT NULL AND diameter > 0.01
+        ORDER BY diameter DESC;
+        IF @base_id IS NULL
+            THROW 50001, N'Nao encontrei asteroide com diametro > 10.', 1;
+    END
+
+    IF @close_7d = 1
+    BEGIN
+        INSERT INTO Close_Approach (id_ca, approach_date, rel_velocity_kms, dist_ld, id_internal)
+        SELECT ISNULL(MAX(id_ca), 0) + 1, DATEADD(DAY, 3, CAST(GETDATE() AS date)), 12.3, 0.5, @base_id
+        FROM Close_Approach;
+
+        INSERT INTO Alert (id_alert, data_generation, criteria_trigger, id_internal, id_priority, id_level)
+        SELECT ISNULL(MAX(id_alert), 0) + 1, SYSDATETIME(),
+               'Close approach < 1 LD within 7 days (date=+3d, dist_ld=0.5)', @base_id, 1, 4
+        FROM Alert;
+
+        SET @created += 1;
+        INSERT INTO @logs VALUES (N'Simulado: aproximacao <1 LD em 7 dias.');
+    END
+
+    IF @cluster_month = 1
+    BEGIN
+        WITH nums AS (
+            SELECT 1 AS n UNION ALL SELECT 2 UNION ALL SELECT 3
+            UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6
+        )
+        INSERT INTO Close_Approach (id_ca, approach_date, rel_velocity_kms, dist_ld, id_internal)
+        SELECT
+            (SELECT ISNULL(MAX(id_ca), 0) FROM Close_Approach) + n,
+            DATEADD(DAY, n, DATEFROMPARTS(YEAR(GETDATE()), MONTH(GETDATE()), 1)),
+            8.5,
+            5.0,
+            @base_id
+        FROM nums;
+
+        INSERT INTO Alert (id_alert, data_generation, criteria_trigger, id_internal, id_priority, id_level)
+        SELECT ISNULL(MAX(id_alert), 0) + 1, SYSDATETIME(),
+               'Clustered close approaches <10 LD in month', @base_id, 3, 1
+        FROM Alert;
+
+        SET @created += 1;
+        INSERT INTO @logs VALUES (N'Simulado: cluster mensal >5 aproximacoes <10 LD.');
+    END
+
+    IF @pha_uncertain = 1
+    BEGIN
+        SET @id = NULL;
+        SELECT TOP 1 @id = id_internal
+        FROM Asteroid
+        WHERE pha_flag = 'Y' AND diameter IS NOT NULL AND diameter > 0.1
+        ORDER BY diameter DESC;
+        IF @id IS NOT NULL
+        BEGIN
+            UPDATE TOP (1) Orbit
+            SET rms = 0.9, moid_ld = 10
+            WHERE id_internal = @id;
+
+            INSERT INTO Alert (id_alert, data_generation, criteria_trigger, id_internal, id_priority, id_level)
+            SELECT ISNULL(MAX(id_alert), 0) + 1, SYSDATETIME(),
+                   'PHA uncertain: diameter>100m, rms>0.8, moid_ld<20', @id, 1, 3
+            FROM Alert;
+
+            SET @created += 1;
+            INSERT INTO @logs VALUES (N'Simulado: PHA incerto (rms>0.8, moid_ld<20).');
+        END
+    END
+
+    IF @new_large = 1
+    BEGIN
+        SET @id = NULL;
+        SELECT TOP 1 @id = id_internal
+        FROM Asteroid
+        WHERE diameter IS NOT NULL AND diameter > 0.5
+          AND created_at >= DATEADD(MONTH, -1, SYSDATETIME())
+        ORDER BY diameter DESC;
+        IF @id IS NOT NULL
+        BEGIN
+            UPDATE TOP (1) Orbit
+            SET moid_ld = 30
+            WHERE id_internal = @id;
+
+            INSERT INTO Alert (id_alert, data_generation, criteria_trigger, id_internal, id_priority, id_level)
+            SELECT ISNULL(MAX(id_alert), 0) + 1, SYSDATETIME(),
+                   'New large asteroid: diameter>500m, moid_ld<50, discovered last month', @id, 2, 2
+            FROM Alert;
+
+            SET @created += 1;
+            INSERT INTO @logs VALUES (N'Simulado: novo asteroide grande (ultimo mes).');
+        END
+    END
+
+    IF @anomaly = 1
+    BEGIN
+        SET @id = NULL;
+        SELECT TOP 1 @id = id_internal
+        FROM Asteroid
+        WHERE diameter IS NOT NULL AND diameter > 0.2
+          AND albedo IS NOT NULL AND albedo > 0.3
+        ORDER BY diameter DESC;
+        IF @id IS NOT NULL
+        BEGIN
+            UPDATE TOP (1) Orbit
+            SET e = 0.85, i = 75
+            WHERE id_internal = @id;
+
+            INSERT INTO Alert (id_alert, data_generation, criteria_trigger, id_internal, id_priority, id_level)
+            SELECT ISNULL(MAX(id_alert), 0) + 1, SYSDATETIME(),
+                   'Anomaly: albedo>0.3 AND e>0.8 AND i>70 AND diameter>200m', @id, 3, 1
+            FROM Alert;
+
+            SET @created += 1;
+            INSERT INTO @logs VALUES (N'Simulado: anomalia (albedo/e/i/diametro).');
+        END
+    END
+
+    IF @significant_change = 1
+    BEGIN
+        SET @id = NULL;
+        SELECT TOP 1 @id = id_internal
+        FROM Orbit
+        WHERE id_internal IS NOT NULL
+        ORDER BY epoch DESC;
+        IF @id IS NOT NULL
+        BEGIN
+            DECLARE @new_orb varchar(50) = CONCAT('SIM_', LOWER(CONVERT(varchar(36), NEWID())));
+
+            INSERT INTO Orbit (
+                id_orbita, epoch, rms, moid_ld, epoch_mjd, epoch_cal,
+                tp, tp_cal, per, per_y, equinox,
+                orbit_uncertainty, condition_code,
+                e, a, q, i, om, w, ma, ad, n, moid,
+                sigma_e, sigma_a, sigma_q, sigma_i, sigma_n, sigma_ma, sigma_om, sigma_w, sigma_ad, sigma_tp, sigma_per,
+                id_internal, class
+            )
+            SELECT TOP 1
+                @new_orb, o.epoch + 1, o.rms, o.moid_ld, o.epoch_mjd + 1,
+                DATEADD(DAY, 1, COALESCE(o.epoch_cal, CAST(GETDATE() AS date))),
+                o.tp + 1, DATEADD(DAY, 1, COALESCE(o.tp_cal, CAST(GETDATE() AS date))),
+                o.per, o.per_y, o.equinox,
+                o.orbit_uncertainty, o.condition_code,
+                o.e + 0.1, o.a, o.q, o.i + 3, o.om, o.w, o.ma, o.ad, o.n, o.moid,
+                o.sigma_e, o.sigma_a, o.sigma_q, o.sigma_i, o.sigma_n, o.sigma_ma, o.sigma_om, o.sigma_w, o.sigma_ad, o.sigma_tp, o.sigma_per,
+                o.id_internal, o.class
+            FROM Orbit o
+            WHERE o.id_internal = @id
+            ORDER BY o.epoch DESC;
+
+            INSERT INTO Alert (id_alert, data_generation, criteria_trigger, id_internal, id_priority, id_level)
+            SELECT ISNULL(MAX(id_alert), 0) + 1, SYSDATETIME(),
+                   'Significant orbital change: |delta e|>0.05 OR |delta i|>2', @id, 2, 2
+            FROM Alert;
+
+            SET @created += 1;
+            INSERT INTO @logs VALUES (N'Simulado: mudanca orbital significativa (novo Orbit).');
+        END
+    END
+
+    SELECT msg FROM @logs;
+    SELECT @created AS created;
+END
+GO
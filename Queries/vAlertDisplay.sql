@@ -0,0 +1,36 @@
+-- View indexada com as colunas de apresentacao dos alertas ja resolvidas.
+-- SQL Server materializa o join uma vez e mantem-no incrementalmente; o
+-- refresh da lista deixa de pagar tres joins por fetch. O refresh_alerts
+-- (app_sql_client.py) usa-a com NOEXPAND quando existir; sem esta migracao
+-- continua a ler de vw_Alerts_Detail.
+--
+-- Nota: views indexadas nao admitem OUTER JOIN; como id_internal,
+-- id_priority e id_level sao FKs obrigatorias no Alert, os INNER JOIN
+-- nao descartam linhas.
+
+IF OBJECT_ID('dbo.vAlertDisplay', 'V') IS NOT NULL
+    DROP VIEW dbo.vAlertDisplay;
+GO
+
+CREATE VIEW dbo.vAlertDisplay
+WITH SCHEMABINDING
+AS
+SELECT
+    a.id_alert,
+    a.data_generation,
+    a.criteria_trigger,
+    a.id_priority,
+    a.id_level,
+    ast.id_internal,
+    p.name AS priority_name,
+    l.description AS level_description,
+    ast.full_name AS asteroid_name
+FROM dbo.Alert a
+JOIN dbo.Priority p ON p.id_priority = a.id_priority
+JOIN dbo.Level l ON l.id_level = a.id_level
+JOIN dbo.Asteroid ast ON ast.id_internal = a.id_internal;
+GO
+
+CREATE UNIQUE CLUSTERED INDEX ix_vAlertDisplay
+    ON dbo.vAlertDisplay (id_alert);
+GO